@@ -3,11 +3,19 @@ Main Streamlit Application for Intelligent BRD Generator
 """
 
 import streamlit as st
+import hashlib
+import html
+import json
 import os
+import re
 import sys
+import time
+from collections import OrderedDict
 from datetime import datetime
+from types import MappingProxyType
 from typing import Dict, Any
 import logging
+from markdown_it import MarkdownIt
 
 # Add project root to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -21,6 +29,43 @@ from config.settings import Config
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sections without markdown markers are shown as plain text; large markdown is rendered to HTML server-side
+MARKDOWN_MARKERS = re.compile(r'[*_`#\[]')
+SERVER_RENDER_MIN_CHARS = 2000
+
+# Model output echoes user input, so raw HTML in it is escaped rather than passed through to the page
+MARKDOWN_RENDERER = MarkdownIt("commonmark", {"html": False})
+
+# Required text fields and their minimum lengths
+REQUIRED_TEXT_FIELDS = MappingProxyType({
+    "project_title": 5,
+    "project_description": 20,
+    "business_objectives": 15,
+    "stakeholders": 10
+})
+
+# Number of generated BRDs kept per browser session
+MAX_STORED_BRDS = 5
+
+# Preview layout limits
+PREVIEW_EXPANDED_SECTIONS = 2
+PREVIEW_TRUNCATE_CHARS = 5000
+
+class Throttle:
+    """Rate-limit UI updates so fast loops don't flood the browser with rerenders"""
+    
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self._last = 0.0
+    
+    def should_emit(self) -> bool:
+        """Return True if at least `interval` seconds have passed since the last emitted update"""
+        now = time.monotonic()
+        if now - self._last >= self.interval:
+            self._last = now
+            return True
+        return False
+
 # Initialize services
 @st.cache_resource
 def initialize_services():
@@ -143,93 +188,157 @@ def create_input_form():
 def validate_form_data(form_data: Dict[str, Any]) -> bool:
     """Validate form data before processing"""
     
+    errors = []
+    
     # Check domain separately since it's a selectbox with short values
     if not form_data.get("domain"):
-        st.error("Please select a business domain")
-        return False
+        errors.append("Please select a business domain")
     
     # Check other required fields with minimum length validation
-    text_fields = {
-        "project_title": 5,
-        "project_description": 20,
-        "business_objectives": 15,
-        "stakeholders": 10
-    }
+    for field, min_length in REQUIRED_TEXT_FIELDS.items():
+        field_value = (form_data.get(field) or "").strip()
+        if len(field_value) < min_length:
+            errors.append(f"Please provide a valid {field.replace('_', ' ').title()} (minimum {min_length} characters)")
     
-    for field, min_length in text_fields.items():
-        field_value = form_data.get(field)
-        if not field_value or len(field_value.strip()) < min_length:
-            st.error(f"Please provide a valid {field.replace('_', ' ').title()} (minimum {min_length} characters)")
-            return False
+    # Report every problem at once so users can fix them in a single round-trip
+    if errors:
+        st.error("\n\n".join(errors))
+        return False
     
     return True
 
+@st.cache_data(show_spinner=False)
+def render_markdown_html(content: str) -> str:
+    """Render markdown to HTML once per distinct section content"""
+    return MARKDOWN_RENDERER.render(content)
+
+def display_section_content(section_content: str):
+    """Display section content using the cheapest suitable element"""
+    
+    if not MARKDOWN_MARKERS.search(section_content):
+        st.text(section_content)
+    elif len(section_content) >= SERVER_RENDER_MIN_CHARS:
+        st.markdown(render_markdown_html(section_content), unsafe_allow_html=True)
+    else:
+        st.markdown(section_content)
+
 def display_brd_preview(brd_sections: Dict[str, str]):
     """Display a preview of the generated BRD"""
     
     st.subheader("📖 BRD Preview")
     
-    # Create tabs for different sections
-    tabs = st.tabs(list(brd_sections.keys()))
-    
+    # Collapse sections so only the first few are rendered open on each rerun
     for i, (section_name, section_content) in enumerate(brd_sections.items()):
-        with tabs[i]:
-            if section_content:
-                st.markdown(f"### {section_name}")
-                st.write(section_content)
-            else:
+        with st.expander(section_name, expanded=i < PREVIEW_EXPANDED_SECTIONS):
+            if not section_content:
                 st.info(f"Content for {section_name} will be generated based on specific requirements")
+            elif len(section_content) > PREVIEW_TRUNCATE_CHARS:
+                if st.toggle("Show full section", key=f"show_full_{section_name}"):
+                    display_section_content(section_content)
+                else:
+                    display_section_content(section_content[:PREVIEW_TRUNCATE_CHARS] + "...")
+            else:
+                display_section_content(section_content)
 
 def display_validation_results(validation_result, quality_metrics):
     """Display validation results and quality metrics"""
     
     st.subheader("🔍 Validation Results")
     
-    # Overall score
-    col1, col2, col3 = st.columns(3)
+    # All scores and metrics go out as one table instead of one widget per value
+    score_color = "🟢" if validation_result.overall_score >= 0.8 else "🟡" if validation_result.overall_score >= 0.6 else "🔴"
+    sections_with_content = sum(1 for s in quality_metrics["section_word_counts"].values() if s > 0)
     
-    with col1:
-        score_color = "🟢" if validation_result.overall_score >= 0.8 else "🟡" if validation_result.overall_score >= 0.6 else "🔴"
-        st.metric(
-            "Overall Score", 
-            f"{validation_result.overall_score:.2f}/1.00",
-            delta=score_color
-        )
+    metrics = [
+        ("Overall Score", f"{score_color} {validation_result.overall_score:.2f}/1.00"),
+        ("Compliance Score", f"{validation_result.compliance_score:.2f}/1.00"),
+        ("Completeness Score", f"{validation_result.completeness_score:.2f}/1.00"),
+        ("Total Word Count", quality_metrics["total_word_count"]),
+        ("Readability Score", f"{quality_metrics['readability_score']:.2f}/1.00"),
+        ("Structure Score", f"{quality_metrics['structure_score']:.2f}/1.00"),
+        ("Sections with Content", sections_with_content)
+    ]
     
-    with col2:
-        st.metric(
-            "Compliance Score", 
-            f"{validation_result.compliance_score:.2f}/1.00"
-        )
-    
-    with col3:
-        st.metric(
-            "Completeness Score", 
-            f"{validation_result.completeness_score:.2f}/1.00"
-        )
+    header_cells = "".join(f"<th style='text-align:center'>{name}</th>" for name, _ in metrics)
+    value_cells = "".join(f"<td style='text-align:center;font-size:1.25em'>{value}</td>" for _, value in metrics)
+    st.markdown(
+        f"<table style='width:100%'><tr>{header_cells}</tr><tr>{value_cells}</tr></table>",
+        unsafe_allow_html=True
+    )
     
     # Detailed results
     if validation_result.recommendations:
         st.subheader("💡 Recommendations")
-        for i, rec in enumerate(validation_result.recommendations, 1):
-            st.write(f"{i}. {rec}")
+        st.markdown("\n".join(
+            f"{i}. {html.escape(rec)}" for i, rec in enumerate(validation_result.recommendations, 1)
+        ))
     
     if validation_result.warnings:
         st.subheader("⚠️ Warnings")
-        for warning in validation_result.warnings:
-            st.warning(warning)
+        st.warning("\n".join(f"- {html.escape(warning)}" for warning in validation_result.warnings))
+
+@st.fragment
+def display_export_options(brd_sections: Dict[str, str],
+                           validation_result,
+                           quality_metrics: Dict[str, Any],
+                           form_data: Dict[str, Any],
+                           document_service: DocumentService,
+                           validation_service: ValidationService):
+    """Display export actions; runs as a fragment so its buttons don't rerun the whole script"""
+    
+    st.subheader("💾 Export Options")
     
-    # Quality metrics
-    st.subheader("📊 Quality Metrics")
     col1, col2 = st.columns(2)
     
     with col1:
-        st.metric("Total Word Count", quality_metrics["total_word_count"])
-        st.metric("Readability Score", f"{quality_metrics['readability_score']:.2f}/1.00")
+        if st.button("📄 Download as Word Document", type="primary"):
+            try:
+                metadata = {
+                    "Priority": form_data["priority"],
+                    "Generated By": "Intelligent BRD Generator",
+                    "Validation Score": f"{validation_result.overall_score:.2f}/1.00"
+                }
+                
+                # Build the document in memory; it never needs to touch disk for a download
+                filename, document_bytes = document_service.create_brd_bytes(
+                    brd_sections=brd_sections,
+                    domain=form_data["domain"],
+                    project_title=form_data["project_title"],
+                    metadata=metadata
+                )
+                
+                st.success(f"✅ Document generated successfully: {filename}")
+                
+                # Provide download link
+                st.download_button(
+                    label="📥 Download BRD Document",
+                    data=document_bytes,
+                    file_name=filename,
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
+            
+            except Exception as e:
+                st.error(f"❌ Error generating document: {str(e)}")
     
     with col2:
-        st.metric("Structure Score", f"{quality_metrics['structure_score']:.2f}/1.00")
-        st.metric("Sections with Content", len([s for s in quality_metrics['section_word_counts'].values() if s > 0]))
+        if st.button("📋 Generate Validation Report"):
+            validation_report = validation_service.generate_validation_report(
+                validation_result, quality_metrics
+            )
+            
+            st.subheader("📊 Validation Report")
+            st.text(validation_report)
+
+def get_brd_store() -> OrderedDict:
+    """Get this session's bounded store of generated BRDs, most recently used last"""
+    if "brd_store" not in st.session_state:
+        st.session_state["brd_store"] = OrderedDict()
+    return st.session_state["brd_store"]
+
+def get_brd_state_key(form_data: Dict[str, Any]) -> str:
+    """Build the key under which a generated BRD is stored"""
+    digest = hashlib.blake2b(json.dumps(form_data, sort_keys=True).encode("utf-8"), digest_size=16)
+    return f"brd_{digest.hexdigest()}"
 
 def main():
     """Main application function"""
@@ -283,100 +392,97 @@ def main():
             if not validate_form_data(form_data):
                 st.stop()
             
-            # Show progress
-            progress_bar = st.progress(0)
-            status_text = st.empty()
+            brd_key = get_brd_state_key(form_data)
+            brd_store = get_brd_store()
             
-            try:
-                # Step 1: Generate BRD content
-                status_text.text("🤖 Generating BRD content using AI...")
-                progress_bar.progress(25)
+            # Identical submissions in this session reuse the stored BRD instead of calling the AI again
+            if brd_key not in brd_store:
+                # Show progress
+                progress_bar = st.progress(0)
+                status_text = st.empty()
                 
-                brd_sections = ai_service.generate_brd_content(
-                    domain=form_data["domain"],
-                    project_title=form_data["project_title"],
-                    project_description=form_data["project_description"],
-                    business_objectives=form_data["business_objectives"],
-                    stakeholders=form_data["stakeholders"],
-                    additional_requirements=form_data["additional_requirements"]
-                )
-                
-                # Step 2: Validate content
-                status_text.text("🔍 Validating content quality and compliance...")
-                progress_bar.progress(50)
-                
-                validation_result = validation_service.validate_brd_content(
-                    brd_sections, form_data["domain"]
-                )
-                
-                quality_metrics = validation_service.check_document_quality(brd_sections)
+                try:
+                    # Step 1: Generate BRD content
+                    status_text.text("🤖 Generating BRD content using AI...")
+                    progress_bar.progress(25)
+                    
+                    # Render each section as soon as it has been streamed
+                    brd_sections = {}
+                    live_preview = st.empty()
+                    live_sections = live_preview.container()
+                    progress_throttle = Throttle()
+                    
+                    for section_name, section_content in ai_service.stream_brd_content(
+                        domain=form_data["domain"],
+                        project_title=form_data["project_title"],
+                        project_description=form_data["project_description"],
+                        business_objectives=form_data["business_objectives"],
+                        stakeholders=form_data["stakeholders"],
+                        additional_requirements=form_data["additional_requirements"]
+                    ):
+                        brd_sections[section_name] = section_content
+                        live_sections.markdown(f"### {section_name}\n\n{section_content}")
+                        
+                        if progress_throttle.should_emit():
+                            status_text.text(f"🤖 Generated section: {section_name}")
+                            progress_bar.progress(min(25 + 25 * len(brd_sections) // len(Config.BRD_SECTIONS), 50))
+                    
+                    live_preview.empty()
+                    
+                    # Step 2: Validate content (compliance and quality checks share one pass of per-section word counts)
+                    status_text.text("🔍 Validating content quality and compliance...")
+                    progress_bar.progress(50)
+                    
+                    word_counts = validation_service.count_section_words(brd_sections)
+                    validation_result = validation_service.validate_brd_content(
+                        brd_sections, form_data["domain"], word_counts
+                    )
+                    
+                    quality_metrics = validation_service.check_document_quality(brd_sections, word_counts)
+                    
+                    # Step 3: Store results for later reruns
+                    status_text.text("✅ BRD generated successfully!")
+                    progress_bar.progress(100)
+                    
+                    brd_store[brd_key] = (form_data, brd_sections, validation_result, quality_metrics)
+                    while len(brd_store) > MAX_STORED_BRDS:
+                        brd_store.popitem(last=False)
+                    
+                    # Clear progress
+                    progress_bar.empty()
+                    status_text.empty()
                 
-                # Step 3: Display results
-                status_text.text("✅ BRD generated successfully!")
-                progress_bar.progress(100)
+                except Exception as e:
+                    st.error(f"❌ Error generating BRD: {str(e)}")
+                    logger.error(f"BRD generation error: {str(e)}")
+                    progress_bar.empty()
+                    status_text.empty()
+            
+            if brd_key in brd_store:
+                brd_store.move_to_end(brd_key)
+                st.session_state["active_brd_key"] = brd_key
                 
                 # Success message
                 st.success(f"🎉 BRD for '{form_data['project_title']}' has been generated successfully!")
-                
-                # Display preview
-                display_brd_preview(brd_sections)
-                
-                # Display validation results
-                display_validation_results(validation_result, quality_metrics)
-                
-                # Export options
-                st.subheader("💾 Export Options")
-                
-                col1, col2 = st.columns(2)
-                
-                with col1:
-                    if st.button("📄 Download as Word Document", type="primary"):
-                        try:
-                            metadata = {
-                                "Priority": form_data["priority"],
-                                "Generated By": "Intelligent BRD Generator",
-                                "Validation Score": f"{validation_result.overall_score:.2f}/1.00"
-                            }
-                            
-                            filepath = document_service.create_brd_document(
-                                brd_sections=brd_sections,
-                                domain=form_data["domain"],
-                                project_title=form_data["project_title"],
-                                metadata=metadata
-                            )
-                            
-                            st.success(f"✅ Document saved successfully: {filepath}")
-                            
-                            # Provide download link
-                            with open(filepath, "rb") as file:
-                                st.download_button(
-                                    label="📥 Download BRD Document",
-                                    data=file.read(),
-                                    file_name=os.path.basename(filepath),
-                                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                                )
-                        
-                        except Exception as e:
-                            st.error(f"❌ Error generating document: {str(e)}")
-                
-                with col2:
-                    if st.button("📋 Generate Validation Report"):
-                        validation_report = validation_service.generate_validation_report(
-                            validation_result, quality_metrics
-                        )
-                        
-                        st.subheader("📊 Validation Report")
-                        st.text(validation_report)
-                
-                # Clear progress
-                progress_bar.empty()
-                status_text.empty()
-                
-            except Exception as e:
-                st.error(f"❌ Error generating BRD: {str(e)}")
-                logger.error(f"BRD generation error: {str(e)}")
-                progress_bar.empty()
-                status_text.empty()
+        
+        # Display the latest BRD; it stays visible across reruns triggered by other widgets
+        active_brd_key = st.session_state.get("active_brd_key")
+        brd_store = get_brd_store()
+        
+        if active_brd_key in brd_store:
+            brd_form_data, brd_sections, validation_result, quality_metrics = brd_store[active_brd_key]
+            
+            # Display preview
+            display_brd_preview(brd_sections)
+            
+            # Display validation results
+            display_validation_results(validation_result, quality_metrics)
+            
+            # Export options
+            display_export_options(
+                brd_sections, validation_result, quality_metrics, brd_form_data,
+                document_service, validation_service
+            )
     
     with tab2:
         st.header("📚 Sample BRD Documents")
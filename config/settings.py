@@ -2,7 +2,9 @@
 Application settings and configuration
 """
 
+import functools
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -25,15 +27,44 @@ class Config:
     TEMPLATES_DIR = os.path.join(DATA_DIR, "templates")
     GENERATED_DIR = os.path.join(DATA_DIR, "generated")
     COMPLIANCE_DIR = os.path.join(DATA_DIR, "compliance")
+    CACHE_DIR = os.path.join(DATA_DIR, "cache")
     
     # Domain Configuration
     SUPPORTED_DOMAINS = ["Pharma", "Finance"]
+    # Hashed copy for membership checks (the list keeps the display order)
+    SUPPORTED_DOMAIN_SET = frozenset(SUPPORTED_DOMAINS)
     
     # Document Settings
     MAX_TOKENS = 5000
     TEMPERATURE = 0.7
     
+    # Concurrency Settings
+    MAX_CONCURRENT_REQUESTS = 4
+    PARALLEL_SECTION_GENERATION = os.getenv("PARALLEL_SECTION_GENERATION", "false").lower() == "true"
+    SECTION_MAX_TOKENS = 1000
+    MAX_EXPORT_WORKERS = 8
+    
+    # Rate Limit Settings
+    MAX_REQUESTS_PER_SECOND = float(os.getenv("MAX_REQUESTS_PER_SECOND", "2"))
+    RATE_LIMIT_BURST = 4
+    
+    # Retry Settings
+    RETRY_MAX_DELAY = 15
+    
+    # Circuit Breaker Settings
+    CIRCUIT_BREAKER_THRESHOLD = 3
+    CIRCUIT_BREAKER_COOLDOWN = 60
+    HEALTH_CHECK_TTL = 30
+    
+    # Response Cache Settings
+    RESPONSE_CACHE_MAX_ENTRIES = 512
+    RESPONSE_CACHE_TTL = 3600
+    SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    SEMANTIC_CACHE_THRESHOLD = 0.95
+    MISTRAL_EMBED_MODEL = "mistral-embed"
+    
     # Validation Settings
+    VALIDATION_CACHE_MAX_ENTRIES = 64
     COMPLIANCE_KEYWORDS = {
         "Pharma": ["FDA", "21 CFR Part 11", "HIPAA", "GxP", "clinical trial", "adverse event"],
         "Finance": ["Basel III", "GDPR", "credit risk", "probability of default", "loss given default", "collateral"]
@@ -51,25 +82,38 @@ class Config:
         "Project Scope"
     ]
     
+    # Set once validate_config has succeeded so later calls skip the checks and directory creation
+    _VALIDATED = False
+    
     @classmethod
     def validate_config(cls):
         """Validate configuration settings"""
+        if cls._VALIDATED:
+            return True
+        
         if not cls.MISTRAL_API_KEY:
             raise ValueError("MISTRAL_API_KEY is required")
         
+        # Catch keys that can never authenticate before any request is made
+        if cls.MISTRAL_API_KEY.strip() != cls.MISTRAL_API_KEY or cls.MISTRAL_API_KEY == "your_mistral_api_key_here":
+            raise ValueError("MISTRAL_API_KEY is not a valid API key; check your .env file")
+        
         # Create directories if they don't exist
         os.makedirs(cls.TEMPLATES_DIR, exist_ok=True)
         os.makedirs(cls.GENERATED_DIR, exist_ok=True)
         os.makedirs(cls.COMPLIANCE_DIR, exist_ok=True)
+        os.makedirs(cls.CACHE_DIR, exist_ok=True)
         
+        cls._VALIDATED = True
         return True
     
     @classmethod
+    @functools.lru_cache(maxsize=1)
     def get_api_config(cls):
-        """Get Mistral API configuration"""
-        return {
+        """Get Mistral API configuration (built once; read-only because it is shared)"""
+        return MappingProxyType({
             "provider": "mistral",
             "api_key": cls.MISTRAL_API_KEY,
             "model": cls.MISTRAL_MODEL,
             "base_url": cls.MISTRAL_API_BASE_URL
-        }
\ No newline at end of file
+        })
\ No newline at end of file
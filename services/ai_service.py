@@ -3,19 +3,166 @@ AI Service for BRD Generator - Integration with Mistral API
 """
 
 from mistralai import Mistral
-from typing import Dict, List, Optional
+from mistralai.models import JSONSchema, ResponseFormat, SDKError
+from types import MappingProxyType
+from typing import Dict, Final, Iterator, List, Mapping, Optional, Tuple
+import asyncio
+import functools
+import httpx
+import json
 import logging
+import re
 import time
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import retry, stop_after_attempt, stop_after_delay, wait_random_exponential, retry_if_exception
 from config.settings import Config
+from services.cache_service import CacheService
+from services.rate_limiter import RateLimiter
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application entry point (app.py)
 logger = logging.getLogger(__name__)
 
+# Domain-specific context and compliance requirements used in the system prompt
+DOMAIN_CONTEXT: Final[Dict[str, str]] = {
+    "pharma": """
+Pharmaceutical Domain Context:
+- Regulatory Framework: FDA 21 CFR Part 11, HIPAA, GxP guidelines
+- Key Processes: Clinical trials, adverse event reporting, drug safety monitoring
+- Data Requirements: Patient data anonymization, electronic health record (EHR) integration
+- Compliance Focus: Data integrity, audit trails, validation protocols
+- Terminology: Clinical trial phases, investigational medicinal products, pharmacovigilance
+""",
+    "finance": """
+Finance Domain Context:
+- Regulatory Framework: Basel III, GDPR, SOX, financial reporting standards
+- Key Processes: Credit risk assessment, loan default prediction, collateral management
+- Data Requirements: Financial data security, customer data protection, audit readiness
+- Compliance Focus: Risk management, capital adequacy, data privacy
+- Terminology: Probability of Default (PD), Loss Given Default (LGD), credit scoring, risk-weighted assets
+"""
+}
+DEFAULT_DOMAIN_CONTEXT: Final[str] = "General business context with standard compliance requirements."
+
+# Prompt templates; only the per-request fields are substituted at call time
+SYSTEM_PROMPT_TEMPLATE: Final[str] = """You are an expert Business Analyst specializing in {domain} domain. Generate comprehensive, professional Business Requirement Documents (BRDs) that are compliance-ready and aligned with industry best practices.
+
+Domain Context: {domain_context}
+
+Your responses must:
+- Use industry-standard terminology
+- Include relevant compliance requirements
+- Provide practical implementation details
+- Be well-structured and professional
+- Address all specified sections comprehensively"""
+
+USER_PROMPT_TEMPLATE: Final[str] = """Generate a detailed Business Requirement Document (BRD) with the following specifications:
+
+**Domain**: {domain}
+**Project Title**: {project_title}
+**Project Description**: {project_description}
+**Business Objectives**: {business_objectives}
+**Key Stakeholders**: {stakeholders}
+**Additional Requirements**: {additional_requirements}
+
+Generate a comprehensive BRD with these exact sections:
+""" + "\n".join(f"{number}. {section}" for number, section in enumerate(Config.BRD_SECTIONS, 1)) + """
+
+For each section, provide detailed, domain-specific content. {format_instructions}"""
+
+SECTION_PROMPT_TEMPLATE: Final[str] = """Write the "{section}" section of a detailed Business Requirement Document (BRD) with the following specifications:
+
+**Domain**: {domain}
+**Project Title**: {project_title}
+**Project Description**: {project_description}
+**Business Objectives**: {business_objectives}
+**Key Stakeholders**: {stakeholders}
+**Additional Requirements**: {additional_requirements}
+
+Provide detailed, domain-specific content for this section only. Do not repeat the section heading."""
+
+MARKDOWN_FORMAT_INSTRUCTIONS: Final[str] = "Format your response with clear section headings using the exact section names provided above."
+STRUCTURED_FORMAT_INSTRUCTIONS: Final[str] = "Return a JSON object whose keys are the exact section names provided above and whose values are the section content."
+
+# User prompt variants with the fixed format instructions already filled in, so only the form fields vary per request
+MARKDOWN_USER_PROMPT_TEMPLATE: Final[str] = USER_PROMPT_TEMPLATE.replace("{format_instructions}", MARKDOWN_FORMAT_INSTRUCTIONS)
+STRUCTURED_USER_PROMPT_TEMPLATE: Final[str] = USER_PROMPT_TEMPLATE.replace("{format_instructions}", STRUCTURED_FORMAT_INSTRUCTIONS)
+
+# Structured output schema: one string field per required BRD section
+BRD_RESPONSE_FORMAT: Final[ResponseFormat] = ResponseFormat(
+    type="json_schema",
+    json_schema=JSONSchema(
+        name="brd_sections",
+        schema_definition={
+            "type": "object",
+            "properties": {section: {"type": "string"} for section in Config.BRD_SECTIONS},
+            "required": list(Config.BRD_SECTIONS),
+            "additionalProperties": False
+        },
+        strict=True
+    )
+)
+
+# Lowercased keywords that mark a section header in the model response
+SECTION_KEYWORDS: Final[Tuple[str, ...]] = (
+    "project overview", "business objectives", "functional requirements",
+    "non-functional requirements", "key performance indicators", "kpis",
+    "compliance", "risk assessment", "stakeholder analysis", "project scope"
+)
+SECTION_HEADER_PATTERN: Final[re.Pattern] = re.compile(
+    r"\b(?:" + "|".join(re.escape(keyword) for keyword in SECTION_KEYWORDS) + r")\b",
+    re.IGNORECASE
+)
+
+REQUIRED_SECTIONS: Final[frozenset] = frozenset(Config.BRD_SECTIONS)
+
+def _missing_sections(sections: Mapping[str, str]) -> List[str]:
+    """Required sections absent from sections, in the configured order"""
+    # Fast path in C for the common case of a complete response
+    if sections.keys() >= REQUIRED_SECTIONS:
+        return []
+    missing = REQUIRED_SECTIONS.difference(sections)
+    return [section for section in Config.BRD_SECTIONS if section in missing]
+
+def _stream_deltas(stream) -> Iterator[str]:
+    """Yield the non-empty text deltas of a Mistral chat stream"""
+    for event in stream:
+        if not event.data.choices:
+            continue
+        
+        delta = event.data.choices[0].delta.content
+        if isinstance(delta, str) and delta:
+            yield delta
+
+@functools.lru_cache(maxsize=1)
+def _placeholder_sections() -> Mapping[str, str]:
+    """Read-only BRD skeleton with placeholder text for every required section"""
+    return MappingProxyType({
+        section: f"[Content for {section} will be generated based on specific requirements]"
+        for section in Config.BRD_SECTIONS
+    })
+
+@functools.lru_cache(maxsize=8)
+def _build_system_message(domain: str) -> str:
+    """Format the system prompt once per domain; it only depends on the domain context"""
+    return SYSTEM_PROMPT_TEMPLATE.format(
+        domain=domain,
+        domain_context=DOMAIN_CONTEXT.get(domain.lower(), DEFAULT_DOMAIN_CONTEXT)
+    )
+
+# HTTP statuses worth retrying: rate limiting and transient server-side failures
+RETRYABLE_STATUS_CODES: Final[frozenset] = frozenset({429, 500, 502, 503, 504})
+
+def _is_transient_error(error: BaseException) -> bool:
+    """Check whether a failed request may succeed if retried"""
+    if isinstance(error, (httpx.TimeoutException, httpx.ConnectError, ConnectionError, TimeoutError)):
+        return True
+    return isinstance(error, SDKError) and getattr(error, "status_code", None) in RETRYABLE_STATUS_CODES
+
 class AIService:
     """Service class for Mistral AI model integration"""
     
+    # Shared by all instances so the account-wide request rate is respected
+    _rate_limiter = RateLimiter(Config.MAX_REQUESTS_PER_SECOND, Config.RATE_LIMIT_BURST)
+    
     def __init__(self):
         """Initialize the AI service with Mistral API"""
         try:
@@ -23,6 +170,15 @@ class AIService:
             self.api_config = Config.get_api_config()
             
             self._init_mistral()
+            self._init_cache()
+            
+            # Circuit breaker state: consecutive failed API calls and when requests may resume
+            self._consecutive_failures = 0
+            self._circuit_open_until = 0.0
+            
+            # Last live health check result and when it was taken
+            self._health_ok = None
+            self._health_checked_at = 0.0
                 
             logger.info("AI Service initialized successfully with Mistral provider")
             
@@ -38,12 +194,70 @@ class AIService:
         )
         logger.info("Mistral API client initialized")
     
+    def _init_cache(self):
+        """Initialize the BRD response cache, with the semantic tier when enabled"""
+        embed_fn = self._embed_text if Config.SEMANTIC_CACHE_ENABLED else None
+        self.response_cache = CacheService(embed_fn=embed_fn)
+    
+    def _embed_text(self, text: str) -> List[float]:
+        """Embed text with Mistral for semantic cache lookups"""
+        response = self.mistral_client.embeddings.create(
+            model=Config.MISTRAL_EMBED_MODEL,
+            inputs=[text]
+        )
+        return response.data[0].embedding
+    
+    def _cache_key(self, job: Dict[str, str]) -> str:
+        """Build the response cache key for a BRD generation request"""
+        # Surrounding whitespace doesn't change the prompt's meaning, while the model and
+        # temperature change the output, so both are part of the key
+        return CacheService.make_key(
+            self.api_config["model"], str(Config.TEMPERATURE),
+            *((job.get(field) or "").strip() for field in (
+                "domain", "project_title", "project_description",
+                "business_objectives", "stakeholders", "additional_requirements"
+            ))
+        )
+    
+    @staticmethod
+    def _semantic_text(job: Dict[str, str]) -> str:
+        """Build the text embedded for semantic cache lookups"""
+        # Every form field is embedded, so a near-duplicate description alone can't return
+        # a BRD written for a different title, objectives or stakeholders
+        return "\n".join(
+            f"{field}: {(job.get(field) or '').strip()}" for field in (
+                "project_title", "project_description", "business_objectives",
+                "stakeholders", "additional_requirements"
+            )
+        )
+    
+    def _check_circuit(self):
+        """Fail fast while the API is in its post-failure cooldown window"""
+        if time.monotonic() < self._circuit_open_until:
+            raise ConnectionError("Mistral API is temporarily unavailable after repeated failures; please try again shortly")
+    
+    def _record_api_success(self):
+        """Close the circuit after a successful API call"""
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+    
+    def _record_api_failure(self):
+        """Count a failed API call and open the circuit once the threshold is reached"""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= Config.CIRCUIT_BREAKER_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + Config.CIRCUIT_BREAKER_COOLDOWN
+            logger.warning(f"Mistral API failed {self._consecutive_failures} times in a row, pausing requests for {Config.CIRCUIT_BREAKER_COOLDOWN} seconds")
+    
     @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError, Exception))
+        stop=stop_after_attempt(3) | stop_after_delay(Config.RETRY_MAX_DELAY),
+        wait=wait_random_exponential(multiplier=0.25, max=4),
+        retry=retry_if_exception(_is_transient_error)
     )
-    def _make_mistral_request(self, messages: List[Dict], max_tokens: int = None, temperature: float = None) -> str:
+    def _make_mistral_request(self,
+                              messages: List[Dict],
+                              max_tokens: int = None,
+                              temperature: float = None,
+                              response_format: Optional[ResponseFormat] = None) -> str:
         """
         Make a request to Mistral API with retry logic
         
@@ -51,6 +265,7 @@ class AIService:
             messages: List of message dictionaries for the conversation
             max_tokens: Maximum tokens in response
             temperature: Sampling temperature
+            response_format: Optional structured output format
             
         Returns:
             Generated text response
@@ -59,8 +274,8 @@ class AIService:
             Exception: If API request fails after retries
         """
         try:
-            # Rate limiting - add small delay between requests
-            time.sleep(0.5)
+            # Rate limiting - only waits when requests arrive faster than the configured rate
+            self._rate_limiter.acquire()
             
             logger.info(f"Making Mistral API request with model: {self.api_config['model']}")
             
@@ -68,7 +283,8 @@ class AIService:
                 model=self.api_config["model"],
                 messages=messages,
                 max_tokens=max_tokens or Config.MAX_TOKENS,
-                temperature=temperature or Config.TEMPERATURE
+                temperature=temperature or Config.TEMPERATURE,
+                response_format=response_format
             )
             
             if not response or not response.choices:
@@ -83,6 +299,259 @@ class AIService:
             logger.error(f"Mistral API request failed: {str(e)}")
             raise
     
+    def _stream_mistral_request(self, messages: List[Dict], max_tokens: int = None, temperature: float = None) -> Iterator[str]:
+        """
+        Stream a response from Mistral API
+        
+        Opening the stream is retried on transient errors until the first delta arrives; once
+        text has been yielded, a failure is raised to the caller instead of restarting the response.
+        
+        Args:
+            messages: List of message dictionaries for the conversation
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            
+        Yields:
+            Generated text deltas as they arrive
+        """
+        self._check_circuit()
+        
+        try:
+            first_delta, deltas = self._open_mistral_stream(messages, max_tokens, temperature)
+            yield first_delta
+            
+            generated_chars = len(first_delta)
+            for delta in deltas:
+                generated_chars += len(delta)
+                yield delta
+        
+        except Exception:
+            self._record_api_failure()
+            raise
+        
+        self._record_api_success()
+        logger.info(f"Mistral streaming request successful, generated {generated_chars} characters")
+    
+    @retry(
+        stop=stop_after_attempt(3) | stop_after_delay(Config.RETRY_MAX_DELAY),
+        wait=wait_random_exponential(multiplier=0.25, max=4),
+        retry=retry_if_exception(_is_transient_error)
+    )
+    def _open_mistral_stream(self, messages: List[Dict], max_tokens: int = None, temperature: float = None) -> Tuple[str, Iterator[str]]:
+        """
+        Open a streaming Mistral request and wait for its first text delta (retried on transient errors)
+        
+        Returns:
+            The first delta and an iterator over the remaining deltas
+        """
+        self._rate_limiter.acquire()
+        logger.info(f"Making streaming Mistral API request with model: {self.api_config['model']}")
+        
+        stream = self.mistral_client.chat.stream(
+            model=self.api_config["model"],
+            messages=messages,
+            max_tokens=max_tokens or Config.MAX_TOKENS,
+            temperature=temperature or Config.TEMPERATURE
+        )
+        deltas = _stream_deltas(stream)
+        
+        first_delta = next(deltas, None)
+        if first_delta is None:
+            raise ValueError("Empty response from Mistral API")
+        
+        return first_delta, deltas
+    
+    @retry(
+        stop=stop_after_attempt(3) | stop_after_delay(Config.RETRY_MAX_DELAY),
+        wait=wait_random_exponential(multiplier=0.25, max=4),
+        retry=retry_if_exception(_is_transient_error)
+    )
+    async def _amake_mistral_request(self,
+                                     client: Mistral,
+                                     semaphore: asyncio.Semaphore,
+                                     messages: List[Dict],
+                                     max_tokens: int = None,
+                                     temperature: float = None,
+                                     response_format: Optional[ResponseFormat] = None) -> str:
+        """
+        Make a non-blocking request to Mistral API with retry logic
+        
+        Args:
+            client: Mistral client opened for the current event loop
+            semaphore: Semaphore bounding the number of in-flight requests
+            messages: List of message dictionaries for the conversation
+            max_tokens: Maximum tokens in response
+            temperature: Sampling temperature
+            response_format: Optional structured output format
+            
+        Returns:
+            Generated text response
+        """
+        async with semaphore:
+            await self._rate_limiter.acquire_async()
+            logger.info(f"Making async Mistral API request with model: {self.api_config['model']}")
+            
+            response = await client.chat.complete_async(
+                model=self.api_config["model"],
+                messages=messages,
+                max_tokens=max_tokens or Config.MAX_TOKENS,
+                temperature=temperature or Config.TEMPERATURE,
+                response_format=response_format
+            )
+        
+        if not response or not response.choices:
+            raise ValueError("Empty response from Mistral API")
+        
+        generated_text = response.choices[0].message.content
+        logger.info(f"Async Mistral API request successful, generated {len(generated_text)} characters")
+        
+        return generated_text
+    
+    async def agenerate_brd_content_batch(self, jobs: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Generate several BRDs concurrently using Mistral AI
+        
+        Args:
+            jobs: List of keyword-argument dictionaries accepted by generate_brd_content
+            
+        Returns:
+            List of BRD section dictionaries, in the same order as jobs
+        """
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        
+        async def _generate(client: Mistral, job: Dict[str, str]) -> Dict[str, str]:
+            cache_key = self._cache_key(job)
+            cached_sections = self.response_cache.get(cache_key)
+            if cached_sections is not None:
+                return cached_sections
+            
+            messages = self._construct_mistral_messages(
+                job["domain"], job["project_title"], job["project_description"],
+                job["business_objectives"], job["stakeholders"],
+                job.get("additional_requirements", ""),
+                structured=True
+            )
+            self._check_circuit()
+            try:
+                response_text = await self._amake_mistral_request(
+                    client, semaphore, messages, response_format=BRD_RESPONSE_FORMAT
+                )
+            except Exception:
+                self._record_api_failure()
+                raise
+            self._record_api_success()
+            
+            brd_sections = self._parse_structured_response(response_text, job["domain"])
+            self.response_cache.set(cache_key, brd_sections, domain=job["domain"])
+            return brd_sections
+        
+        logger.info(f"Generating {len(jobs)} BRDs concurrently using Mistral")
+        
+        # The async HTTP pool is bound to the running event loop, so each batch gets its own client
+        async with Mistral(
+            api_key=self.api_config["api_key"],
+            server_url=self.api_config.get("base_url")
+        ) as client:
+            return await asyncio.gather(*(_generate(client, job) for job in jobs))
+    
+    async def _agenerate_sections(self,
+                                  domain: str,
+                                  project_title: str,
+                                  project_description: str,
+                                  business_objectives: str,
+                                  stakeholders: str,
+                                  additional_requirements: str) -> Dict[str, str]:
+        """Generate every BRD section with its own concurrent Mistral request"""
+        
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        system_message = {
+            "role": "system",
+            "content": _build_system_message(domain)
+        }
+        
+        def _section_messages(section: str) -> List[Dict]:
+            user_message = SECTION_PROMPT_TEMPLATE.format(
+                section=section,
+                domain=domain,
+                project_title=project_title,
+                project_description=project_description,
+                business_objectives=business_objectives,
+                stakeholders=stakeholders,
+                additional_requirements=additional_requirements
+            )
+            return [system_message, {"role": "user", "content": user_message}]
+        
+        logger.info(f"Generating {len(Config.BRD_SECTIONS)} BRD sections concurrently using Mistral")
+        
+        async with Mistral(
+            api_key=self.api_config["api_key"],
+            server_url=self.api_config.get("base_url")
+        ) as client:
+            contents = await asyncio.gather(*(
+                self._amake_mistral_request(
+                    client, semaphore, _section_messages(section), max_tokens=Config.SECTION_MAX_TOKENS
+                )
+                for section in Config.BRD_SECTIONS
+            ))
+        
+        sections = dict(_placeholder_sections())
+        for section, content in zip(Config.BRD_SECTIONS, contents):
+            content = content.strip()
+            if content:
+                sections[section] = content
+        
+        return sections
+    
+    async def agenerate_brd_content(self,
+                                    domain: str,
+                                    project_title: str,
+                                    project_description: str,
+                                    business_objectives: str,
+                                    stakeholders: str,
+                                    additional_requirements: str = "") -> Dict[str, str]:
+        """
+        Generate BRD content using Mistral AI without blocking the running event loop
+        
+        Args:
+            domain: Business domain (Pharma/Finance)
+            project_title: Title of the project
+            project_description: Description of the project
+            business_objectives: Business objectives
+            stakeholders: Key stakeholders
+            additional_requirements: Any additional requirements
+        
+        Returns:
+            Dictionary containing generated BRD sections
+        """
+        brd_batch = await self.agenerate_brd_content_batch([{
+            "domain": domain,
+            "project_title": project_title,
+            "project_description": project_description,
+            "business_objectives": business_objectives,
+            "stakeholders": stakeholders,
+            "additional_requirements": additional_requirements
+        }])
+        return brd_batch[0]
+    
+    def generate_brd_content_batch(self, jobs: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """
+        Generate several BRDs concurrently (synchronous wrapper)
+        
+        Args:
+            jobs: List of keyword-argument dictionaries accepted by generate_brd_content
+            
+        Returns:
+            List of BRD section dictionaries, in the same order as jobs
+        """
+        try:
+            brd_batch = asyncio.run(self.agenerate_brd_content_batch(jobs))
+            logger.info(f"Generated {len(brd_batch)} BRDs successfully")
+            return brd_batch
+            
+        except Exception as e:
+            logger.error(f"Error generating BRD batch: {str(e)}")
+            raise
+    
     def generate_brd_content(self, 
                             domain: str, 
                             project_title: str,
@@ -108,22 +577,164 @@ class AIService:
         try:
             logger.info(f"Generating BRD content for {domain} domain using Mistral")
             
-            # Construct Mistral messages
+            # Serve repeated (or near-duplicate) submissions from the response cache
+            job = {
+                "domain": domain,
+                "project_title": project_title,
+                "project_description": project_description,
+                "business_objectives": business_objectives,
+                "stakeholders": stakeholders,
+                "additional_requirements": additional_requirements
+            }
+            cache_key = self._cache_key(job)
+            semantic_text = self._semantic_text(job)
+            
+            cached_sections = self.response_cache.get(cache_key, domain=domain, text=semantic_text)
+            if cached_sections is not None:
+                return cached_sections
+            
+            self._check_circuit()
+            try:
+                if Config.PARALLEL_SECTION_GENERATION:
+                    # One request per section; latency is bounded by the slowest section, not the sum
+                    brd_sections = asyncio.run(self._agenerate_sections(
+                        domain, project_title, project_description,
+                        business_objectives, stakeholders, additional_requirements
+                    ))
+                else:
+                    # Construct Mistral messages
+                    messages = self._construct_mistral_messages(
+                        domain, project_title, project_description, 
+                        business_objectives, stakeholders, additional_requirements,
+                        structured=True
+                    )
+                    
+                    response_text = self._make_mistral_request(messages, response_format=BRD_RESPONSE_FORMAT)
+                    
+                    # Parse and structure the response
+                    brd_sections = self._parse_structured_response(response_text, domain)
+            except Exception:
+                self._record_api_failure()
+                raise
+            self._record_api_success()
+            
+            self.response_cache.set(cache_key, brd_sections, domain=domain, text=semantic_text)
+            
+            logger.info("BRD content generated successfully")
+            return brd_sections
+            
+        except Exception as e:
+            logger.error(f"Error generating BRD content: {str(e)}")
+            raise
+    
+    def stream_brd_content(self, 
+                           domain: str, 
+                           project_title: str,
+                           project_description: str,
+                           business_objectives: str,
+                           stakeholders: str,
+                           additional_requirements: str = "") -> Iterator[Tuple[str, str]]:
+        """
+        Generate BRD content using Mistral AI, yielding each section as soon as it is complete
+        
+        Args:
+            domain: Business domain (Pharma/Finance)
+            project_title: Title of the project
+            project_description: Description of the project
+            business_objectives: Business objectives
+            stakeholders: Key stakeholders
+            additional_requirements: Any additional requirements
+            
+        Yields:
+            (section_name, section_content) tuples; placeholders for missing required sections come last
+        """
+        
+        try:
+            logger.info(f"Streaming BRD content for {domain} domain using Mistral")
+            
+            job = {
+                "domain": domain,
+                "project_title": project_title,
+                "project_description": project_description,
+                "business_objectives": business_objectives,
+                "stakeholders": stakeholders,
+                "additional_requirements": additional_requirements
+            }
+            cache_key = self._cache_key(job)
+            semantic_text = self._semantic_text(job)
+            
+            cached_sections = self.response_cache.get(cache_key, domain=domain, text=semantic_text)
+            if cached_sections is not None:
+                yield from cached_sections.items()
+                return
+            
+            if Config.PARALLEL_SECTION_GENERATION:
+                # Sharded sections finish together, so there is nothing to stream incrementally
+                yield from self.generate_brd_content(
+                    domain, project_title, project_description,
+                    business_objectives, stakeholders, additional_requirements
+                ).items()
+                return
+            
             messages = self._construct_mistral_messages(
                 domain, project_title, project_description, 
                 business_objectives, stakeholders, additional_requirements
             )
             
-            response_text = self._make_mistral_request(messages)
+            brd_sections = {}
+            current_section = None
+            current_content = []
+            partial_line = []
             
-            # Parse and structure the response
-            brd_sections = self._parse_response(response_text, domain)
+            def _close_section():
+                content = '\n'.join(current_content).strip()
+                brd_sections[current_section] = content
+                return current_section, content
             
-            logger.info("BRD content generated successfully")
-            return brd_sections
+            def _feed_line(line: str) -> Iterator[Tuple[str, str]]:
+                nonlocal current_section, current_content
+                line = line.strip()
+                
+                if self._is_section_header(line):
+                    if current_section:
+                        yield _close_section()
+                    
+                    current_section = line.replace('#', '').strip()
+                    current_content = []
+                
+                elif line and current_section:
+                    current_content.append(line)
+            
+            for delta in self._stream_mistral_request(messages):
+                # Buffer fragments of the current line and only join them once it is complete
+                if '\n' not in delta:
+                    partial_line.append(delta)
+                    continue
+                
+                first_line, *complete_lines = delta.split('\n')
+                partial_line.append(first_line)
+                complete_lines.insert(0, ''.join(partial_line))
+                partial_line = [complete_lines.pop()]
+                
+                for line in complete_lines:
+                    yield from _feed_line(line)
+            
+            # Flush the trailing partial line and the last open section
+            yield from _feed_line(''.join(partial_line))
+            
+            if current_section and current_content:
+                yield _close_section()
+            
+            placeholders = _placeholder_sections()
+            for required_section in _missing_sections(brd_sections):
+                brd_sections[required_section] = placeholders[required_section]
+                yield required_section, brd_sections[required_section]
+            
+            self.response_cache.set(cache_key, brd_sections, domain=domain, text=semantic_text)
+            logger.info("BRD content streamed successfully")
             
         except Exception as e:
-            logger.error(f"Error generating BRD content: {str(e)}")
+            logger.error(f"Error streaming BRD content: {str(e)}")
             raise
     
     def _construct_mistral_messages(self, 
@@ -132,123 +743,80 @@ class AIService:
                                  project_description: str,
                                  business_objectives: str,
                                  stakeholders: str,
-                                 additional_requirements: str) -> List[Dict]:
+                                 additional_requirements: str,
+                                 structured: bool = False) -> List[Dict]:
         """Construct Mistral-specific message format for BRD generation"""
         
-        domain_context = self._get_domain_context(domain)
+        system_message = _build_system_message(domain)
+        
+        user_template = STRUCTURED_USER_PROMPT_TEMPLATE if structured else MARKDOWN_USER_PROMPT_TEMPLATE
+        user_message = user_template.format(
+            domain=domain,
+            project_title=project_title,
+            project_description=project_description,
+            business_objectives=business_objectives,
+            stakeholders=stakeholders,
+            additional_requirements=additional_requirements
+        )
         
-        system_message = f"""You are an expert Business Analyst specializing in {domain} domain. Generate comprehensive, professional Business Requirement Documents (BRDs) that are compliance-ready and aligned with industry best practices.
-
-Domain Context: {domain_context}
-
-Your responses must:
-- Use industry-standard terminology
-- Include relevant compliance requirements
-- Provide practical implementation details
-- Be well-structured and professional
-- Address all specified sections comprehensively"""
-
-        user_message = f"""Generate a detailed Business Requirement Document (BRD) with the following specifications:
-
-**Domain**: {domain}
-**Project Title**: {project_title}
-**Project Description**: {project_description}
-**Business Objectives**: {business_objectives}
-**Key Stakeholders**: {stakeholders}
-**Additional Requirements**: {additional_requirements}
-
-Generate a comprehensive BRD with these exact sections:
-1. Project Overview
-2. Business Objectives
-3. Functional Requirements
-4. Non-Functional Requirements
-5. Key Performance Indicators (KPIs)
-6. Compliance & Risk Assessment
-7. Stakeholder Analysis
-8. Project Scope
-
-For each section, provide detailed, domain-specific content. Format your response with clear section headings using the exact section names provided above."""
-
         return [
             {"role": "system", "content": system_message},
             {"role": "user", "content": user_message}
         ]
     
-    def _get_domain_context(self, domain: str) -> str:
-        """Get domain-specific context and compliance requirements"""
+    def _parse_structured_response(self, response_text: str, domain: str) -> Dict[str, str]:
+        """Parse a structured (JSON) AI response into BRD sections"""
         
-        if domain.lower() == "pharma":
-            return """
-Pharmaceutical Domain Context:
-- Regulatory Framework: FDA 21 CFR Part 11, HIPAA, GxP guidelines
-- Key Processes: Clinical trials, adverse event reporting, drug safety monitoring
-- Data Requirements: Patient data anonymization, electronic health record (EHR) integration
-- Compliance Focus: Data integrity, audit trails, validation protocols
-- Terminology: Clinical trial phases, investigational medicinal products, pharmacovigilance
-"""
+        try:
+            payload = json.loads(response_text)
+        except json.JSONDecodeError:
+            payload = None
         
-        elif domain.lower() == "finance":
-            return """
-Finance Domain Context:
-- Regulatory Framework: Basel III, GDPR, SOX, financial reporting standards
-- Key Processes: Credit risk assessment, loan default prediction, collateral management
-- Data Requirements: Financial data security, customer data protection, audit readiness
-- Compliance Focus: Risk management, capital adequacy, data privacy
-- Terminology: Probability of Default (PD), Loss Given Default (LGD), credit scoring, risk-weighted assets
-"""
+        if not isinstance(payload, dict):
+            # Models without structured output support may still answer in markdown
+            logger.warning("Structured response was not a JSON object, falling back to section parsing")
+            return self._parse_response(response_text, domain)
         
-        else:
-            return "General business context with standard compliance requirements."
+        sections = dict(_placeholder_sections())
+        
+        for required_section in Config.BRD_SECTIONS:
+            content = str(payload.get(required_section) or "").strip()
+            if content:
+                sections[required_section] = content
+        
+        return sections
     
     def _parse_response(self, response_text: str, domain: str) -> Dict[str, str]:
         """Parse the AI response into structured BRD sections"""
         
         sections = {}
-        current_section = None
-        current_content = []
-        
-        lines = response_text.split('\n')
+        # Each line is stripped once, here; header detection and section content both use the stripped lines
+        lines = [line.strip() for line in response_text.split('\n')]
         
-        for line in lines:
-            line = line.strip()
-            
-            # Check if line is a section header
+        # Record where each section header starts, then slice the lines once per section
+        boundaries = []
+        for index, line in enumerate(lines):
             if self._is_section_header(line):
-                # Save previous section if exists
-                if current_section:
-                    sections[current_section] = '\n'.join(current_content).strip()
-                
-                # Start new section
-                current_section = line.replace('#', '').strip()
-                current_content = []
-            
-            elif line and current_section:
-                current_content.append(line)
+                boundaries.append((index, line.replace('#', '').strip()))
         
-        # Save last section
-        if current_section and current_content:
-            sections[current_section] = '\n'.join(current_content).strip()
+        for position, (start, current_section) in enumerate(boundaries):
+            end = boundaries[position + 1][0] if position + 1 < len(boundaries) else len(lines)
+            content = '\n'.join(line for line in lines[start + 1:end] if line)
+            
+            # The last section is only kept when it has content
+            if content or end != len(lines):
+                sections[current_section] = content
         
         # Ensure all required sections are present
-        for required_section in Config.BRD_SECTIONS:
-            if required_section not in sections:
-                sections[required_section] = f"[Content for {required_section} will be generated based on specific requirements]"
+        placeholders = _placeholder_sections()
+        for required_section in _missing_sections(sections):
+            sections[required_section] = placeholders[required_section]
         
         return sections
     
     def _is_section_header(self, line: str) -> bool:
         """Check if a line is a section header"""
-        section_keywords = [
-            "Project Overview", "Business Objectives", "Functional Requirements",
-            "Non-Functional Requirements", "Key Performance Indicators", "KPIs",
-            "Compliance", "Risk Assessment", "Stakeholder Analysis", "Project Scope"
-        ]
-        
-        for keyword in section_keywords:
-            if keyword.lower() in line.lower():
-                return True
-        
-        return False
+        return SECTION_HEADER_PATTERN.search(line) is not None
     
     def validate_api_connection(self) -> bool:
         """Validate connection to Mistral API"""
@@ -264,10 +832,31 @@ Finance Domain Context:
             logger.error(f"API connection validation failed: {str(e)}")
             return False
     
+    def health_check(self, force: bool = False) -> bool:
+        """
+        Check connectivity to Mistral API, reusing a recent result
+        
+        Args:
+            force: Ping the API even if a result younger than HEALTH_CHECK_TTL is cached
+        
+        Returns:
+            True if the API responded
+        """
+        now = time.monotonic()
+        if force or self._health_ok is None or now - self._health_checked_at > Config.HEALTH_CHECK_TTL:
+            self._health_ok = self.validate_api_connection()
+            self._health_checked_at = now
+        return self._health_ok
+    
     def get_provider_info(self) -> Dict[str, str]:
-        """Get information about the Mistral AI provider"""
+        """Get information about the Mistral AI provider without making an API call"""
+        if self._health_ok is None:
+            status = "unchecked"
+        else:
+            status = "connected" if self._health_ok else "disconnected"
+        
         return {
             "provider": "mistral",
             "model": self.api_config["model"],
-            "status": "connected" if self.validate_api_connection() else "disconnected"
+            "status": status
         }
\ No newline at end of file
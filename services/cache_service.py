@@ -0,0 +1,222 @@
+"""
+Cache Service for BRD Generator - Caches generated BRD content across requests
+"""
+
+from collections import OrderedDict
+from hashlib import blake2b
+from typing import Callable, Dict, List, Optional
+import logging
+import os
+import shelve
+import threading
+import time
+import numpy as np
+from config.settings import Config
+
+# Logging is configured by the application entry point (app.py)
+logger = logging.getLogger(__name__)
+
+# Recent text embeddings kept so a lookup miss and the following store embed the request only once
+RECENT_EMBEDDINGS_SIZE = 16
+
+class CacheService:
+    """Two-tier cache for generated BRD content (exact match + optional semantic match)"""
+    
+    def __init__(self,
+                 cache_path: str = None,
+                 max_entries: int = None,
+                 embed_fn: Optional[Callable[[str], List[float]]] = None,
+                 similarity_threshold: float = None,
+                 ttl: float = None):
+        """
+        Initialize the cache service
+        
+        Args:
+            cache_path: Path of the shelve file used to persist entries
+            max_entries: Maximum number of cached BRDs kept in memory
+            embed_fn: Optional function returning an embedding for a text; enables the semantic tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            ttl: Seconds an entry stays valid after it is stored
+        """
+        self.cache_path = cache_path or os.path.join(Config.CACHE_DIR, "brd_cache")
+        self.max_entries = max_entries or Config.RESPONSE_CACHE_MAX_ENTRIES
+        self.similarity_threshold = similarity_threshold or Config.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = ttl or Config.RESPONSE_CACHE_TTL
+        self._embed_fn = embed_fn
+        self._entries = OrderedDict()
+        self._recent_embeddings = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self._load()
+        logger.info(f"Cache Service initialized with {len(self._entries)} entries")
+    
+    @staticmethod
+    def make_key(*parts: str) -> str:
+        """Build a stable cache key from the request inputs"""
+        digest = blake2b(digest_size=16)
+        for part in parts:
+            digest.update((part or "").encode("utf-8"))
+            digest.update(b"\x1f")
+        return digest.hexdigest()
+    
+    def get(self, key: str, domain: str = None, text: str = None) -> Optional[Dict[str, str]]:
+        """
+        Look up cached BRD sections
+        
+        Args:
+            key: Exact-match key from make_key
+            domain: Business domain, used to scope semantic matches
+            text: Free text to embed for the semantic tier (skipped when None)
+        
+        Returns:
+            A copy of the cached BRD sections, or None on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_expired(entry):
+                del self._entries[key]
+                self._persist_removal([key])
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+                logger.info("Response cache hit (exact)")
+                return dict(entry["sections"])
+        
+        if self._embed_fn is None or text is None:
+            return None
+        
+        return self._semantic_get(domain, text)
+    
+    def set(self, key: str, sections: Dict[str, str], domain: str = None, text: str = None):
+        """
+        Store BRD sections in the cache
+        
+        Args:
+            key: Exact-match key from make_key
+            sections: Generated BRD sections
+            domain: Business domain, used to scope semantic matches
+            text: Free text to embed for the semantic tier (skipped when None)
+        """
+        entry = {"sections": dict(sections), "domain": domain, "embedding": None, "created_at": time.time()}
+        
+        if self._embed_fn is not None and text is not None:
+            try:
+                entry["embedding"] = self._embed(text)
+            except Exception as e:
+                logger.warning(f"Failed to embed cache entry: {str(e)}")
+        
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            evicted = []
+            while len(self._entries) > self.max_entries:
+                evicted.append(self._entries.popitem(last=False)[0])
+            self._persist(key, entry, evicted)
+    
+    def clear(self):
+        """Remove all cached entries"""
+        with self._lock:
+            self._entries.clear()
+            try:
+                with shelve.open(self.cache_path, flag="n"):
+                    pass
+            except Exception as e:
+                logger.warning(f"Failed to clear persisted cache: {str(e)}")
+    
+    def _semantic_get(self, domain: str, text: str) -> Optional[Dict[str, str]]:
+        """Return the closest cached BRD for the same domain if it is similar enough"""
+        
+        with self._lock:
+            expired = [key for key, entry in self._entries.items() if self._is_expired(entry)]
+            if expired:
+                for key in expired:
+                    del self._entries[key]
+                self._persist_removal(expired)
+            
+            candidates = [
+                entry for entry in self._entries.values()
+                if entry["embedding"] is not None and entry["domain"] == domain
+            ]
+        
+        if not candidates:
+            return None
+        
+        try:
+            query = self._embed(text)
+        except Exception as e:
+            logger.warning(f"Failed to embed cache query: {str(e)}")
+            return None
+        
+        similarities = np.stack([entry["embedding"] for entry in candidates]) @ query
+        best = int(np.argmax(similarities))
+        
+        if similarities[best] >= self.similarity_threshold:
+            logger.info(f"Response cache hit (semantic, similarity {similarities[best]:.3f})")
+            return dict(candidates[best]["sections"])
+        
+        return None
+    
+    def _embed(self, text: str) -> np.ndarray:
+        """Embed text as a unit vector, reusing the embedding if the same text was embedded recently"""
+        with self._lock:
+            vector = self._recent_embeddings.get(text)
+        if vector is not None:
+            return vector
+        
+        vector = self._normalize(self._embed_fn(text))
+        with self._lock:
+            self._recent_embeddings[text] = vector
+            while len(self._recent_embeddings) > RECENT_EMBEDDINGS_SIZE:
+                self._recent_embeddings.popitem(last=False)
+        return vector
+    
+    def _is_expired(self, entry: Dict) -> bool:
+        """Check whether an entry is older than the configured TTL"""
+        return time.time() - entry.get("created_at", 0) > self.ttl
+    
+    @staticmethod
+    def _normalize(vector: List[float]) -> np.ndarray:
+        """Return a unit-length float32 vector so dot products are cosine similarities"""
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+    
+    def _load(self):
+        """Load persisted entries from disk"""
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with shelve.open(self.cache_path) as db:
+                entries = [(key, db[key]) for key in db.keys()]
+                
+                # dbm key order is arbitrary, so keep the newest live entries by their stored timestamp
+                live_entries = [(key, entry) for key, entry in entries if not self._is_expired(entry)]
+                live_entries.sort(key=lambda item: item[1].get("created_at", 0))
+                for key, entry in live_entries[-self.max_entries:]:
+                    self._entries[key] = entry
+                
+                # Everything not loaded (expired or beyond max_entries) is dropped from disk too, so the
+                # shelve file holds the same entries as memory and doesn't grow across restarts
+                for key, _ in entries:
+                    if key not in self._entries:
+                        del db[key]
+        except Exception as e:
+            logger.warning(f"Failed to load persisted cache: {str(e)}")
+    
+    def _persist_removal(self, keys: List[str]):
+        """Delete entries from disk"""
+        try:
+            with shelve.open(self.cache_path) as db:
+                for key in keys:
+                    db.pop(key, None)
+        except Exception as e:
+            logger.warning(f"Failed to remove persisted cache entries: {str(e)}")
+    
+    def _persist(self, key: str, entry: Dict, evicted: List[str]):
+        """Write an entry through to disk and drop evicted keys"""
+        try:
+            with shelve.open(self.cache_path) as db:
+                db[key] = entry
+                for old_key in evicted:
+                    db.pop(old_key, None)
+        except Exception as e:
+            logger.warning(f"Failed to persist cache entry: {str(e)}")
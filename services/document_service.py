@@ -4,18 +4,172 @@ Document Service for BRD Generator - Handles document generation and export
 
 from docx import Document
 from docx.shared import Inches, Pt
-from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
 from docx.enum.style import WD_STYLE_TYPE
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, List, Optional, Tuple, Union
+from xml.sax.saxutils import escape
+import asyncio
+import functools
+import io
 import os
+import re
+import zipfile
 from datetime import datetime
 import logging
 from config.settings import Config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application entry point (app.py)
 logger = logging.getLogger(__name__)
 
+# Paragraph style ids defined by python-docx's default template
+TITLE_STYLE_ID = "Title"
+HEADING_1_STYLE_ID = "Heading1"
+HEADING_2_STYLE_ID = "Heading2"
+LIST_BULLET_STYLE_ID = "ListBullet"
+LIST_NUMBER_STYLE_ID = "ListNumber"
+
+EMPTY_PARAGRAPH_XML = "<w:p/>"
+PAGE_BREAK_XML = '<w:p><w:r><w:br w:type="page"/></w:r></w:p>'
+
+# Tabs and line breaks become their own run elements, as python-docx does for run text
+RUN_CONTROL_PATTERN = re.compile(r"([\t\r\n])")
+
+# Characters XML 1.0 cannot represent; python-docx rejects these as well
+INVALID_XML_CHARS_PATTERN = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]")
+
+DOCUMENT_PART = "word/document.xml"
+
+# Zip compression used for the package: "fast" stores parts uncompressed, trading a larger file for
+# skipping the deflate step (useful for interim outputs that are re-processed or streamed right away)
+PACKAGE_COMPRESSION = {
+    "default": zipfile.ZIP_DEFLATED,
+    "fast": zipfile.ZIP_STORED
+}
+
+# Text preview layout
+PREVIEW_SECTION_CHARS = 200
+PREVIEW_SECTION_SEPARATOR = "\n\n" + "-" * 50 + "\n"
+
+# Anything but letters, digits, underscores, spaces and hyphens is dropped from file names
+# (\w matches exactly str.isalnum() characters plus the underscore)
+FILENAME_UNSAFE_PATTERN = re.compile(r"[^\w \-]+")
+
+# Compliance references listed in the appendix, by lowercased domain
+COMPLIANCE_REFERENCES = {
+    "pharma": (
+        "FDA 21 CFR Part 11 - Electronic Records and Signatures",
+        "HIPAA - Health Insurance Portability and Accountability Act",
+        "GxP - Good Practice Guidelines",
+        "Clinical Trial Regulations (21 CFR Part 312)",
+        "Adverse Event Reporting Requirements (21 CFR Part 314.80)"
+    ),
+    "finance": (
+        "Basel III - International Regulatory Framework for Banks",
+        "GDPR - General Data Protection Regulation",
+        "SOX - Sarbanes-Oxley Act",
+        "Risk Management Guidelines",
+        "Data Privacy and Security Standards"
+    )
+}
+DEFAULT_COMPLIANCE_REFERENCES = ("Standard compliance requirements",)
+
+GLOSSARY_TEMPLATE = """
+        This document contains domain-specific terminology relevant to the {domain} industry.
+        For detailed definitions and explanations, please refer to the respective regulatory
+        guidelines and industry standards mentioned in the compliance references.
+        """
+
+@functools.lru_cache(maxsize=1)
+def _template_parts() -> Tuple[Tuple[Tuple[str, bytes], ...], bytes, bytes]:
+    """
+    Serialize python-docx's default template and unpack it once per process
+    
+    Returns:
+        The template's zip members in order, and its document.xml split where body content is inserted
+        (just before the closing section properties)
+    """
+    template = io.BytesIO()
+    Document().save(template)
+    
+    with zipfile.ZipFile(template) as package:
+        members = tuple((name, package.read(name)) for name in package.namelist())
+    
+    document_xml = dict(members)[DOCUMENT_PART]
+    insert_at = document_xml.rindex(b"<w:sectPr")
+    return members, document_xml[:insert_at], document_xml[insert_at:]
+
+def _write_package(target: Union[str, BinaryIO], body_xml: str, compression: int = zipfile.ZIP_DEFLATED):
+    """Write a .docx package made of the template's parts with body_xml inserted into its document"""
+    members, document_head, document_tail = _template_parts()
+    document_xml = document_head + body_xml.encode("utf-8") + document_tail
+    
+    with zipfile.ZipFile(target, "w", compression) as package:
+        for name, data in members:
+            package.writestr(name, document_xml if name == DOCUMENT_PART else data)
+
+def _run_xml(text: str, bold: bool = False) -> str:
+    """Render a <w:r> run for text the same way python-docx's add_run does"""
+    content = []
+    for piece in RUN_CONTROL_PATTERN.split(text):
+        if piece == "\t":
+            content.append("<w:tab/>")
+        elif piece in ("\r", "\n"):
+            content.append("<w:br/>")
+        elif piece:
+            if INVALID_XML_CHARS_PATTERN.search(piece):
+                raise ValueError("All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters")
+            space = ' xml:space="preserve"' if len(piece.strip()) < len(piece) else ""
+            content.append(f"<w:t{space}>{escape(piece)}</w:t>")
+    
+    properties = "<w:rPr><w:b/></w:rPr>" if bold else ""
+    if not properties and not content:
+        return "<w:r/>"
+    return f"<w:r>{properties}{''.join(content)}</w:r>"
+
+def _paragraph_xml(runs: str = "", style_id: Optional[str] = None, center: bool = False) -> str:
+    """Render a <w:p> paragraph around already rendered runs"""
+    properties = ""
+    if style_id is not None or center:
+        style = f'<w:pStyle w:val="{style_id}"/>' if style_id is not None else ""
+        alignment = '<w:jc w:val="center"/>' if center else ""
+        properties = f"<w:pPr>{style}{alignment}</w:pPr>"
+    
+    if not properties and not runs:
+        return EMPTY_PARAGRAPH_XML
+    return f"<w:p>{properties}{runs}</w:p>"
+
+def _text_paragraph_xml(text: str, style_id: Optional[str] = None, center: bool = False) -> str:
+    """Render a paragraph holding a single run of text"""
+    return _paragraph_xml(_run_xml(text) if text else "", style_id, center)
+
+# Paragraphs with fixed text are rendered once at import rather than for every document
+DOCUMENT_TITLE_XML = _text_paragraph_xml('Business Requirement Document', TITLE_STYLE_ID, center=True)
+TABLE_OF_CONTENTS_HEADING_XML = _text_paragraph_xml('Table of Contents', HEADING_1_STYLE_ID)
+CONTENT_PLACEHOLDER_XML = _text_paragraph_xml("[Content to be developed]")
+
+@functools.lru_cache(maxsize=16)
+def _appendix_xml(domain: str) -> str:
+    """Render the appendix with domain-specific information (it depends on nothing else, so once per domain)"""
+    
+    # Add appendix heading
+    parts = [
+        PAGE_BREAK_XML,
+        _text_paragraph_xml('Appendix', HEADING_1_STYLE_ID),
+        _text_paragraph_xml('Compliance References', HEADING_2_STYLE_ID)
+    ]
+    
+    compliance_items = COMPLIANCE_REFERENCES.get(domain.lower(), DEFAULT_COMPLIANCE_REFERENCES)
+    
+    for item in compliance_items:
+        parts.append(_text_paragraph_xml(item, LIST_BULLET_STYLE_ID))
+    
+    # Add glossary
+    parts.append(EMPTY_PARAGRAPH_XML)
+    parts.append(_text_paragraph_xml('Glossary', HEADING_2_STYLE_ID))
+    
+    parts.append(_text_paragraph_xml(GLOSSARY_TEMPLATE.format(domain=domain)))
+    return "".join(parts)
+
 class DocumentService:
     """Service class for document generation and export"""
     
@@ -29,7 +183,9 @@ class DocumentService:
                            brd_sections: Dict[str, str],
                            domain: str,
                            project_title: str,
-                           metadata: Dict = None) -> str:
+                           metadata: Dict = None,
+                           output: Optional[BinaryIO] = None,
+                           compression: str = "default") -> str:
         """
         Create a BRD document in Word format
         
@@ -38,171 +194,194 @@ class DocumentService:
             domain: Business domain
             project_title: Title of the project
             metadata: Additional metadata for the document
+            output: Optional binary stream to write the document to instead of the output directory
+            compression: "default" for a deflate-compressed package, or "fast" to store parts
+                uncompressed (quicker to write, larger file)
             
         Returns:
-            File path of the generated document
+            File path of the generated document, or its suggested file name when written to output
         """
         
+        if compression not in PACKAGE_COMPRESSION:
+            raise ValueError(f"Unknown compression {compression!r}; expected one of {', '.join(PACKAGE_COMPRESSION)}")
+        
         try:
-            # Create new document
-            doc = Document()
-            
-            # Add title page
-            self._add_title_page(doc, project_title, domain, metadata)
-            
-            # Add table of contents
-            self._add_table_of_contents(doc, list(brd_sections.keys()))
-            
-            # Add BRD sections
-            self._add_brd_sections(doc, brd_sections)
-            
-            # Add appendix
-            self._add_appendix(doc, domain)
+            # Render the title page, table of contents, BRD sections and appendix as document body XML
+            body_xml = "".join((
+                self._title_page_xml(project_title, domain, metadata),
+                self._table_of_contents_xml(list(brd_sections.keys())),
+                self._brd_sections_xml(brd_sections),
+                _appendix_xml(domain)
+            ))
             
             # Generate filename and save
             filename = self._generate_filename(project_title, domain)
+            
+            # The body is written straight into a copy of the template package; no Document object is built
+            if output is not None:
+                _write_package(output, body_xml, PACKAGE_COMPRESSION[compression])
+                logger.info("BRD document written to stream: %s", filename)
+                return filename
+            
             filepath = os.path.join(self.output_dir, filename)
             
-            doc.save(filepath)
-            logger.info(f"BRD document created successfully: {filepath}")
+            _write_package(filepath, body_xml, PACKAGE_COMPRESSION[compression])
+            logger.info("BRD document created successfully: %s", filepath)
             
             return filepath
             
         except Exception as e:
-            logger.error(f"Error creating BRD document: {str(e)}")
+            logger.error("Error creating BRD document: %s", e)
             raise
     
-    def _add_title_page(self, doc: Document, project_title: str, domain: str, metadata: Dict = None):
-        """Add title page to the document"""
+    def create_brd_bytes(self,
+                         brd_sections: Dict[str, str],
+                         domain: str,
+                         project_title: str,
+                         metadata: Dict = None,
+                         compression: str = "default") -> Tuple[str, bytes]:
+        """
+        Create a BRD document in memory, for callers that serve it directly (such as a download)
+        
+        Args:
+            brd_sections: Dictionary containing BRD sections
+            domain: Business domain
+            project_title: Title of the project
+            metadata: Additional metadata for the document
+            compression: "default" or "fast", as for create_brd_document
+        
+        Returns:
+            Suggested file name and the document's bytes
+        """
+        buffer = io.BytesIO()
+        filename = self.create_brd_document(
+            brd_sections, domain, project_title, metadata,
+            output=buffer, compression=compression
+        )
+        return filename, buffer.getvalue()
+    
+    def create_brd_documents_batch(self, jobs: List[Dict]) -> List[str]:
+        """
+        Create several BRD documents in parallel
+        
+        Zip compression releases the GIL, so exports overlap on multi-core machines.
+        
+        Args:
+            jobs: List of keyword-argument dictionaries accepted by create_brd_document
+        
+        Returns:
+            Results of create_brd_document, in the same order as jobs
+        """
+        if not jobs:
+            return []
+        
+        max_workers = min(Config.MAX_EXPORT_WORKERS, os.cpu_count() or 1, len(jobs))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(lambda job: self.create_brd_document(**job), jobs))
+        
+        logger.info("Created %d BRD documents", len(results))
+        return results
+    
+    async def acreate_brd_document(self,
+                                   brd_sections: Dict[str, str],
+                                   domain: str,
+                                   project_title: str,
+                                   metadata: Dict = None,
+                                   output: Optional[BinaryIO] = None,
+                                   compression: str = "default") -> str:
+        """
+        Create a BRD document in a worker thread so async callers can keep other work
+        (such as the next generation request) running while it is serialized
         
-        # Add main title
-        title = doc.add_heading('Business Requirement Document', 0)
-        title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        Args:
+            brd_sections: Dictionary containing BRD sections
+            domain: Business domain
+            project_title: Title of the project
+            metadata: Additional metadata for the document
+            output: Optional binary stream to write the document to instead of the output directory
+            compression: "default" or "fast", as for create_brd_document
         
-        # Add project title
-        project_heading = doc.add_heading(project_title, 1)
-        project_heading.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        Returns:
+            File path of the generated document, or its suggested file name when written to output
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(
+            self.create_brd_document, brd_sections, domain, project_title, metadata, output, compression
+        ))
+    
+    def _title_page_xml(self, project_title: str, domain: str, metadata: Dict = None) -> str:
+        """Render the title page"""
         
-        # Add domain
-        domain_para = doc.add_paragraph()
-        domain_para.add_run(f"Domain: {domain}").bold = True
-        domain_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        parts = [
+            # Main title, project title and domain
+            DOCUMENT_TITLE_XML,
+            _text_paragraph_xml(project_title, HEADING_1_STYLE_ID, center=True),
+            _paragraph_xml(_run_xml(f"Domain: {domain}", bold=True), center=True)
+        ]
         
         # Add metadata
         if metadata:
-            doc.add_paragraph()  # Add space
+            parts.append(EMPTY_PARAGRAPH_XML)  # Add space
             
             for key, value in metadata.items():
-                meta_para = doc.add_paragraph()
-                meta_para.add_run(f"{key}: ").bold = True
-                meta_para.add_run(str(value))
-                meta_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+                parts.append(_paragraph_xml(_run_xml(f"{key}: ", bold=True) + _run_xml(str(value)), center=True))
         
         # Add generation date
-        doc.add_paragraph()
-        date_para = doc.add_paragraph()
-        date_para.add_run(f"Generated on: {datetime.now().strftime('%B %d, %Y')}")
-        date_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+        parts.append(EMPTY_PARAGRAPH_XML)
+        parts.append(_text_paragraph_xml(f"Generated on: {datetime.now().strftime('%B %d, %Y')}", center=True))
         
         # Add page break
-        doc.add_page_break()
+        parts.append(PAGE_BREAK_XML)
+        return "".join(parts)
     
-    def _add_table_of_contents(self, doc: Document, sections: List[str]):
-        """Add table of contents"""
+    def _table_of_contents_xml(self, sections: List[str]) -> str:
+        """Render the table of contents"""
         
-        # Add TOC title
-        toc_heading = doc.add_heading('Table of Contents', 1)
+        parts = [TABLE_OF_CONTENTS_HEADING_XML]
         
-        # Add section list
         for i, section in enumerate(sections, 1):
-            para = doc.add_paragraph()
-            para.add_run(f"{i}. ").bold = True
-            para.add_run(section)
-            para.style = 'List Number'
+            parts.append(_paragraph_xml(_run_xml(f"{i}. ", bold=True) + _run_xml(section), LIST_NUMBER_STYLE_ID))
         
         # Add page break
-        doc.add_page_break()
+        parts.append(PAGE_BREAK_XML)
+        return "".join(parts)
     
-    def _add_brd_sections(self, doc: Document, brd_sections: Dict[str, str]):
-        """Add all BRD sections to the document"""
+    def _brd_sections_xml(self, brd_sections: Dict[str, str]) -> str:
+        """Render all BRD sections"""
         
-        section_number = 1
+        parts = []
         
-        for section_name, section_content in brd_sections.items():
+        for section_number, (section_name, section_content) in enumerate(brd_sections.items(), 1):
             # Add section heading
-            heading = doc.add_heading(f"{section_number}. {section_name}", 1)
+            parts.append(_text_paragraph_xml(f"{section_number}. {section_name}", HEADING_1_STYLE_ID))
             
             # Add section content
             if section_content:
                 # Split content into paragraphs
-                paragraphs = section_content.split('\n')
-                
-                for para_text in paragraphs:
+                for para_text in section_content.split('\n'):
                     para_text = para_text.strip()
                     if para_text:
-                        # Check if it's a bullet point or numbered list
-                        if para_text.startswith('-') or para_text.startswith('*'):
-                            para = doc.add_paragraph(para_text[1:].strip(), style='List Bullet')
-                        elif para_text[0].isdigit() and '.' in para_text[:3]:
-                            para = doc.add_paragraph(para_text, style='List Number')
+                        # Check if it's a bullet point or numbered list from its first character
+                        marker = para_text[0]
+                        if marker in '-*':
+                            parts.append(_text_paragraph_xml(para_text[1:].strip(), LIST_BULLET_STYLE_ID))
+                        elif marker.isdigit() and '.' in para_text[1:3]:
+                            parts.append(_text_paragraph_xml(para_text, LIST_NUMBER_STYLE_ID))
                         else:
-                            para = doc.add_paragraph(para_text)
+                            parts.append(_text_paragraph_xml(para_text))
             else:
-                doc.add_paragraph("[Content to be developed]")
+                parts.append(CONTENT_PLACEHOLDER_XML)
             
             # Add some space between sections
-            doc.add_paragraph()
-            section_number += 1
-    
-    def _add_appendix(self, doc: Document, domain: str):
-        """Add appendix with domain-specific information"""
-        
-        # Add appendix heading
-        doc.add_page_break()
-        appendix_heading = doc.add_heading('Appendix', 1)
-        
-        # Add compliance references
-        compliance_heading = doc.add_heading('Compliance References', 2)
-        
-        if domain.lower() == "pharma":
-            compliance_items = [
-                "FDA 21 CFR Part 11 - Electronic Records and Signatures",
-                "HIPAA - Health Insurance Portability and Accountability Act",
-                "GxP - Good Practice Guidelines",
-                "Clinical Trial Regulations (21 CFR Part 312)",
-                "Adverse Event Reporting Requirements (21 CFR Part 314.80)"
-            ]
-        elif domain.lower() == "finance":
-            compliance_items = [
-                "Basel III - International Regulatory Framework for Banks",
-                "GDPR - General Data Protection Regulation",
-                "SOX - Sarbanes-Oxley Act",
-                "Risk Management Guidelines",
-                "Data Privacy and Security Standards"
-            ]
-        else:
-            compliance_items = ["Standard compliance requirements"]
-        
-        for item in compliance_items:
-            para = doc.add_paragraph(item, style='List Bullet')
-        
-        # Add glossary
-        doc.add_paragraph()
-        glossary_heading = doc.add_heading('Glossary', 2)
-        
-        glossary_text = """
-        This document contains domain-specific terminology relevant to the {domain} industry.
-        For detailed definitions and explanations, please refer to the respective regulatory
-        guidelines and industry standards mentioned in the compliance references.
-        """.format(domain=domain)
+            parts.append(EMPTY_PARAGRAPH_XML)
         
-        doc.add_paragraph(glossary_text)
+        return "".join(parts)
     
     def _generate_filename(self, project_title: str, domain: str) -> str:
         """Generate a unique filename for the BRD document"""
         
         # Clean project title for filename
-        clean_title = "".join(c for c in project_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+        clean_title = FILENAME_UNSAFE_PATTERN.sub("", project_title).rstrip()
         clean_title = clean_title.replace(' ', '_')
         
         # Add timestamp and domain
@@ -238,19 +417,20 @@ class DocumentService:
             Formatted text preview
         """
         
-        preview_lines = []
-        preview_lines.append("=== BRD DOCUMENT PREVIEW ===\n")
+        preview_parts = ["=== BRD DOCUMENT PREVIEW ===\n"]
         
         for section_name, section_content in brd_sections.items():
-            preview_lines.append(f"## {section_name}")
+            preview_parts.append(f"\n## {section_name}\n")
             
             if section_content:
-                # Show first 200 characters of each section
-                preview = section_content[:200] + "..." if len(section_content) > 200 else section_content
-                preview_lines.append(preview)
+                # Show first 200 characters of each section; the ellipsis is its own part so
+                # the slice is never copied again to append it
+                preview_parts.append(section_content[:PREVIEW_SECTION_CHARS])
+                if len(section_content) > PREVIEW_SECTION_CHARS:
+                    preview_parts.append("...")
             else:
-                preview_lines.append("[Content to be developed]")
+                preview_parts.append("[Content to be developed]")
             
-            preview_lines.append("\n" + "-" * 50 + "\n")
+            preview_parts.append(PREVIEW_SECTION_SEPARATOR)
         
-        return "\n".join(preview_lines)
\ No newline at end of file
+        return "".join(preview_parts)
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Rate Limiter for BRD Generator - Token bucket shared by outgoing API requests
+"""
+
+import asyncio
+import threading
+import time
+
+class RateLimiter:
+    """Token bucket that only delays callers when the configured request rate would be exceeded"""
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the rate limiter
+        
+        Args:
+            rate: Sustained number of requests allowed per second; zero or less disables throttling
+            burst: Number of requests that may be made back to back before throttling starts
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Take one token and return how long the caller must wait before using it"""
+        if self.rate <= 0:
+            return 0.0
+        
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            
+            # Tokens may go negative so concurrent callers queue up in arrival order
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+    
+    def acquire(self):
+        """Block until a request may be made"""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be made"""
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
\ No newline at end of file
@@ -2,13 +2,17 @@
 Validation Service for BRD Generator - Handles content validation and compliance checking
 """
 
+from collections import OrderedDict
+import copy
+import functools
+from hashlib import blake2b
 import re
+import threading
 from typing import Dict, List, Tuple
 import logging
 from config.settings import Config
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Logging is configured by the application entry point (app.py)
 logger = logging.getLogger(__name__)
 
 class ValidationResult:
@@ -59,63 +63,113 @@ class ValidationService:
         """Initialize the validation service"""
         self.compliance_keywords = Config.COMPLIANCE_KEYWORDS
         self.required_sections = Config.BRD_SECTIONS
+        
+        # Keywords paired with their lowercased form once, kept in configured order for recommendations
+        self._compliance_keywords_lower = {
+            domain: tuple((keyword, keyword.lower()) for keyword in keywords)
+            for domain, keywords in self.compliance_keywords.items()
+        }
+        
+        # Results of recent validations keyed by content hash, so re-validating unchanged sections is a lookup
+        self._result_cache = OrderedDict()
+        self._result_cache_lock = threading.Lock()
         logger.info("Validation Service initialized successfully")
     
     def validate_brd_content(self, 
                             brd_sections: Dict[str, str],
-                            domain: str) -> ValidationResult:
+                            domain: str,
+                            word_counts: Dict[str, int] = None) -> ValidationResult:
         """
         Validate BRD content for compliance, terminology, and completeness
         
         Args:
             brd_sections: Dictionary containing BRD sections
             domain: Business domain (Pharma/Finance)
+            word_counts: Optional per-section word counts from count_section_words
             
         Returns:
             ValidationResult object with validation details
         """
         
+        cache_key = self._result_cache_key(brd_sections, domain)
+        with self._result_cache_lock:
+            cached = self._result_cache.get(cache_key)
+            if cached is not None:
+                self._result_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("Validation cache hit")
+            return copy.deepcopy(cached)
+        
         result = ValidationResult()
         
         try:
+            # Both keyword checks search the same lowercased text, so build it once
+            all_content = self._joined_lower(brd_sections)
+            
             # Validate compliance keywords
-            result.compliance_score = self._validate_compliance_keywords(brd_sections, domain)
+            result.compliance_score, result.missing_keywords = self._validate_compliance_keywords(all_content, domain)
             
             # Validate domain terminology
-            result.terminology_score = self._validate_domain_terminology(brd_sections, domain)
+            result.terminology_score = self._validate_domain_terminology(all_content, domain)
             
             # Validate section completeness
-            result.completeness_score = self._validate_section_completeness(brd_sections)
+            result.completeness_score, result.missing_sections = self._validate_section_completeness(brd_sections)
             
             # Generate recommendations
-            self._generate_recommendations(result, brd_sections, domain)
+            if word_counts is None:
+                word_counts = self.count_section_words(brd_sections)
+            self._generate_recommendations(result, domain, word_counts)
             
             # Calculate overall score
             result.calculate_overall_score()
             
-            logger.info(f"Validation completed with overall score: {result.overall_score:.2f}")
+            logger.info("Validation completed with overall score: %.2f", result.overall_score)
             
+            with self._result_cache_lock:
+                self._result_cache[cache_key] = copy.deepcopy(result)
+                while len(self._result_cache) > Config.VALIDATION_CACHE_MAX_ENTRIES:
+                    self._result_cache.popitem(last=False)
+        
         except Exception as e:
-            logger.error(f"Error during validation: {str(e)}")
+            logger.error("Error during validation: %s", e)
             result.warnings.append(f"Validation error: {str(e)}")
             result.is_valid = False
         
         return result
     
-    def _validate_compliance_keywords(self, brd_sections: Dict[str, str], domain: str) -> float:
-        """Validate presence of compliance keywords"""
+    @staticmethod
+    def _result_cache_key(brd_sections: Dict[str, str], domain: str) -> Tuple[str, bytes]:
+        """Build the validation cache key from the domain and a digest of the section names and content"""
+        digest = blake2b(digest_size=16)
+        for name, content in brd_sections.items():
+            digest.update((name or "").encode("utf-8"))
+            digest.update(b"\x1f")
+            digest.update((content or "").encode("utf-8"))
+            digest.update(b"\x1e")
+        return domain, digest.digest()
+    
+    @staticmethod
+    def count_section_words(brd_sections: Dict[str, str]) -> Dict[str, int]:
+        """Count the words of every non-empty section in one pass, for reuse across validation and quality checks"""
+        return {name: len(content.split()) for name, content in brd_sections.items() if content}
+    
+    def _joined_lower(self, brd_sections: Dict[str, str]) -> str:
+        """Join all section content into one lowercased string for keyword searches"""
+        return " ".join(brd_sections.values()).lower()
+    
+    def _validate_compliance_keywords(self, all_content: str, domain: str) -> Tuple[float, List[str]]:
+        """Validate presence of compliance keywords in the lowercased document text; returns (score, missing keywords)"""
         
         if domain not in self.compliance_keywords:
-            return 0.5  # Default score for unknown domains
+            return 0.5, []  # Default score for unknown domains
         
-        required_keywords = self.compliance_keywords[domain]
-        all_content = " ".join(brd_sections.values()).lower()
+        required_keywords = self._compliance_keywords_lower[domain]
         
         found_keywords = []
         missing_keywords = []
         
-        for keyword in required_keywords:
-            if keyword.lower() in all_content:
+        for keyword, keyword_lower in required_keywords:
+            if keyword_lower in all_content:
                 found_keywords.append(keyword)
             else:
                 missing_keywords.append(keyword)
@@ -123,35 +177,28 @@ class ValidationService:
         # Calculate score
         score = len(found_keywords) / len(required_keywords) if required_keywords else 0
         
-        # Store missing keywords for recommendations
-        if hasattr(self, '_current_result'):
-            self._current_result.missing_keywords = missing_keywords
+        logger.info("Compliance validation: %d/%d keywords found", len(found_keywords), len(required_keywords))
         
-        logger.info(f"Compliance validation: {len(found_keywords)}/{len(required_keywords)} keywords found")
-        
-        return score
+        return score, missing_keywords
     
-    def _validate_domain_terminology(self, brd_sections: Dict[str, str], domain: str) -> float:
-        """Validate domain-specific terminology usage"""
+    def _validate_domain_terminology(self, all_content: str, domain: str) -> float:
+        """Validate domain-specific terminology usage in the lowercased document text"""
         
         domain_terminology = self._get_domain_terminology(domain)
-        all_content = " ".join(brd_sections.values()).lower()
         
-        found_terms = []
-        for term in domain_terminology:
-            if term.lower() in all_content:
-                found_terms.append(term)
+        # Terms are stored lowercase, so they can be searched for directly
+        found_terms = [term for term in domain_terminology if term in all_content]
         
         # Calculate score based on terminology coverage
         expected_terms = min(5, len(domain_terminology))  # Expect at least 5 domain terms
         score = min(len(found_terms) / expected_terms, 1.0)
         
-        logger.info(f"Terminology validation: {len(found_terms)} domain terms found")
+        logger.info("Terminology validation: %d domain terms found", len(found_terms))
         
         return score
     
-    def _validate_section_completeness(self, brd_sections: Dict[str, str]) -> float:
-        """Validate that all required sections are present and have content"""
+    def _validate_section_completeness(self, brd_sections: Dict[str, str]) -> Tuple[float, List[str]]:
+        """Validate that all required sections are present and have content; returns (score, missing or thin sections)"""
         
         present_sections = list(brd_sections.keys())
         missing_sections = []
@@ -168,20 +215,13 @@ class ValidationService:
         complete_sections = total_sections - len(missing_sections) - len(empty_sections)
         score = complete_sections / total_sections
         
-        # Store missing sections for recommendations
-        if hasattr(self, '_current_result'):
-            self._current_result.missing_sections = missing_sections + empty_sections
-        
-        logger.info(f"Completeness validation: {complete_sections}/{total_sections} sections complete")
+        logger.info("Completeness validation: %d/%d sections complete", complete_sections, total_sections)
         
-        return score
+        return score, missing_sections + empty_sections
     
-    def _generate_recommendations(self, result: ValidationResult, brd_sections: Dict[str, str], domain: str):
+    def _generate_recommendations(self, result: ValidationResult, domain: str, word_counts: Dict[str, int]):
         """Generate improvement recommendations based on validation results"""
         
-        # Store reference to result for use in other methods
-        self._current_result = result
-        
         # Compliance recommendations
         if result.compliance_score < 0.8:
             result.recommendations.append(
@@ -209,43 +249,41 @@ class ValidationService:
             )
         
         # Quality warnings
-        for section_name, section_content in brd_sections.items():
-            if section_content:
-                word_count = len(section_content.split())
-                if word_count < 30:
-                    result.warnings.append(
-                        f"Section '{section_name}' appears to be too brief ({word_count} words)"
-                    )
-        
-        # Remove reference to avoid memory leaks
-        delattr(self, '_current_result')
+        for section_name, word_count in word_counts.items():
+            if word_count < 30:
+                result.warnings.append(
+                    f"Section '{section_name}' appears to be too brief ({word_count} words)"
+                )
     
-    def _get_domain_terminology(self, domain: str) -> List[str]:
-        """Get domain-specific terminology for validation"""
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _get_domain_terminology(domain: str) -> Tuple[str, ...]:
+        """Get domain-specific terminology for validation (constant per domain, so cached)"""
         
         if domain.lower() == "pharma":
-            return [
+            return (
                 "clinical trial", "adverse event", "fda", "hipaa", "gxp",
                 "investigational", "pharmacovigilance", "regulatory", "validation",
                 "protocol", "informed consent", "data integrity", "audit trail"
-            ]
+            )
         
         elif domain.lower() == "finance":
-            return [
+            return (
                 "credit risk", "basel iii", "probability of default", "loss given default",
                 "collateral", "regulatory", "compliance", "risk assessment",
                 "capital adequacy", "stress testing", "audit", "governance"
-            ]
+            )
         
         else:
-            return ["business", "requirements", "stakeholders", "compliance"]
+            return ("business", "requirements", "stakeholders", "compliance")
     
-    def check_document_quality(self, brd_sections: Dict[str, str]) -> Dict[str, any]:
+    def check_document_quality(self, brd_sections: Dict[str, str], word_counts: Dict[str, int] = None) -> Dict[str, any]:
         """
         Perform additional quality checks on the document
         
         Args:
             brd_sections: Dictionary containing BRD sections
+            word_counts: Optional per-section word counts from count_section_words
             
         Returns:
             Dictionary with quality metrics
@@ -259,13 +297,15 @@ class ValidationService:
             "content_quality_issues": []
         }
         
-        total_words = 0
+        if word_counts is None:
+            word_counts = self.count_section_words(brd_sections)
+        
+        quality_metrics["section_word_counts"] = dict(word_counts)
+        total_words = sum(word_counts.values())
         
         for section_name, section_content in brd_sections.items():
             if section_content:
-                word_count = len(section_content.split())
-                quality_metrics["section_word_counts"][section_name] = word_count
-                total_words += word_count
+                word_count = word_counts[section_name]
                 
                 # Check for quality issues
                 if word_count < 20:
@@ -273,14 +313,15 @@ class ValidationService:
                         f"Section '{section_name}' is too brief"
                     )
                 
-                # Check for repetitive content
-                sentences = section_content.split('.')
-                if len(sentences) > 0:
-                    avg_sentence_length = sum(len(s.split()) for s in sentences) / len(sentences)
-                    if avg_sentence_length > 30:
-                        quality_metrics["content_quality_issues"].append(
-                            f"Section '{section_name}' has very long sentences"
-                        )
+                # Check for repetitive content: words per '.'-separated sentence, counted
+                # without materializing the sentences (a '.' also ends the word it touches)
+                sentence_count = section_content.count('.') + 1
+                sentence_words = len(section_content.replace('.', ' ').split())
+                avg_sentence_length = sentence_words / sentence_count
+                if avg_sentence_length > 30:
+                    quality_metrics["content_quality_issues"].append(
+                        f"Section '{section_name}' has very long sentences"
+                    )
         
         quality_metrics["total_word_count"] = total_words
         
@@ -290,7 +331,7 @@ class ValidationService:
         
         # Calculate structure score
         expected_sections = len(self.required_sections)
-        actual_sections = len([s for s in brd_sections.values() if s and len(s.strip()) > 0])
+        actual_sections = sum(1 for s in brd_sections.values() if s and not s.isspace())
         quality_metrics["structure_score"] = actual_sections / expected_sections
         
         return quality_metrics
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup for BRD Generator tests
+"""
+
+import os
+import sys
+
+# Add project root to path so the config and services packages import as they do in app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
\ No newline at end of file
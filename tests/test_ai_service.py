@@ -0,0 +1,183 @@
+"""
+Tests for Mistral response streaming and parsing in the AI service
+"""
+
+import random
+import types
+
+import httpx
+import pytest
+from mistralai.models import SDKError
+
+from config.settings import Config
+from services.ai_service import AIService
+from services.cache_service import CacheService
+from services.rate_limiter import RateLimiter
+
+def _event(text):
+    """Build a streaming chunk event carrying one text delta"""
+    delta = types.SimpleNamespace(content=text)
+    return types.SimpleNamespace(data=types.SimpleNamespace(choices=[types.SimpleNamespace(delta=delta)]))
+
+class StatusError(SDKError):
+    """SDKError carrying only a status code; SDKError's own constructor differs across mistralai 1.x releases"""
+    
+    def __init__(self, message: str, status_code: int):
+        Exception.__init__(self, message)
+        # Set every field either release's __str__ and __repr__ read, the way the SDK itself does
+        for name, value in (("message", message), ("status_code", status_code), ("body", ""),
+                            ("headers", httpx.Headers()), ("raw_response", None)):
+            object.__setattr__(self, name, value)
+
+class FakeChat:
+    """Chat client that replays one planned outcome per stream call"""
+    
+    def __init__(self, plan):
+        self.plan = list(plan)
+        self.calls = 0
+    
+    def stream(self, **kwargs):
+        outcome = self.plan[self.calls]
+        self.calls += 1
+        if isinstance(outcome, Exception):
+            raise outcome
+        return iter(outcome)
+
+@pytest.fixture
+def ai_service(tmp_path, monkeypatch):
+    """AIService with a fake client, a temporary cache and no throttling or retry waits"""
+    monkeypatch.setattr(AIService, "_rate_limiter", RateLimiter(0))
+    monkeypatch.setattr(AIService._open_mistral_stream.retry, "sleep", lambda seconds: None)
+    monkeypatch.setattr(Config, "PARALLEL_SECTION_GENERATION", False)
+    
+    service = AIService.__new__(AIService)
+    service.api_config = {"model": "test-model"}
+    service.mistral_client = types.SimpleNamespace(chat=FakeChat([]))
+    service.response_cache = CacheService(cache_path=str(tmp_path / "brd_cache"))
+    service._consecutive_failures = 0
+    service._circuit_open_until = 0.0
+    return service
+
+def _plan(service, *outcomes):
+    service.mistral_client.chat = FakeChat(outcomes)
+    return service.mistral_client.chat
+
+def _random_response(rng):
+    """Build a markdown response mixing section headers, content and blank lines"""
+    pool = ["## " + section for section in Config.BRD_SECTIONS] + [
+        "Plain text", "  - bullet ", "", "   ", "# Overview", "1. item", "### Project Overview"
+    ]
+    lines = [rng.choice(pool) for _ in range(rng.randint(0, 15))]
+    return '\n'.join(lines) + rng.choice(["", "\n", "trailing text"])
+
+def _random_chunks(rng, text):
+    chunks = []
+    start = 0
+    while start < len(text):
+        size = rng.randint(1, 12)
+        chunks.append(text[start:start + size])
+        start += size
+    return chunks
+
+def _stream(service):
+    return list(service.stream_brd_content("Pharma", "Title", "Description", "Objectives", "Stakeholders"))
+
+def test_streamed_sections_match_parse_response(ai_service):
+    rng = random.Random(7)
+    for _ in range(300):
+        # An empty stream is an error, so empty responses are sent as a single blank delta
+        text = _random_response(rng) or " "
+        ai_service.response_cache.clear()
+        _plan(ai_service, [_event(chunk) for chunk in _random_chunks(rng, text)])
+        
+        streamed = _stream(ai_service)
+        
+        assert dict(streamed) == ai_service._parse_response(text, "Pharma"), text
+
+def test_streamed_sections_are_cached(ai_service):
+    chat = _plan(ai_service, [_event("## Project Overview\nOverview text\n")])
+    
+    first = _stream(ai_service)
+    second = _stream(ai_service)
+    
+    assert chat.calls == 1
+    assert dict(second) == dict(first)
+
+def test_parse_response_splits_on_newlines_only(ai_service):
+    sections = ai_service._parse_response("## Project Overview\nfirst\u2028second\n## Project Scope\nin scope", "Pharma")
+    
+    assert sections["Project Overview"] == "first\u2028second"
+    assert sections["Project Scope"] == "in scope"
+
+def test_opening_the_stream_is_retried_on_transient_errors(ai_service):
+    chat = _plan(ai_service, StatusError("busy", 503), httpx.ConnectError("reset"), [_event("a"), _event(""), _event("b")])
+    
+    assert list(ai_service._stream_mistral_request([])) == ["a", "b"]
+    assert chat.calls == 3
+    assert ai_service._consecutive_failures == 0
+
+def test_client_errors_are_not_retried(ai_service):
+    chat = _plan(ai_service, StatusError("bad request", 400), [_event("a")])
+    
+    with pytest.raises(SDKError):
+        list(ai_service._stream_mistral_request([]))
+    assert chat.calls == 1
+
+def test_errors_after_the_first_delta_are_not_retried(ai_service):
+    def _broken_stream():
+        yield _event("partial")
+        raise httpx.ConnectError("reset")
+    
+    chat = _plan(ai_service, _broken_stream(), [_event("restarted")])
+    received = []
+    
+    with pytest.raises(httpx.ConnectError):
+        for delta in ai_service._stream_mistral_request([]):
+            received.append(delta)
+    assert received == ["partial"]
+    assert chat.calls == 1
+
+def test_empty_stream_raises(ai_service):
+    chat = _plan(ai_service, [_event("")])
+    
+    with pytest.raises(ValueError, match="Empty response"):
+        list(ai_service._stream_mistral_request([]))
+    assert chat.calls == 1
+
+def test_circuit_opens_after_consecutive_failures(ai_service, monkeypatch):
+    monkeypatch.setattr(Config, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    chat = _plan(ai_service, StatusError("bad request", 400), StatusError("bad request", 400), [_event("a")])
+    
+    for _ in range(2):
+        with pytest.raises(SDKError):
+            list(ai_service._stream_mistral_request([]))
+    
+    with pytest.raises(ConnectionError, match="temporarily unavailable"):
+        list(ai_service._stream_mistral_request([]))
+    assert chat.calls == 2
+
+def test_circuit_closes_after_cooldown_and_success(ai_service, monkeypatch):
+    monkeypatch.setattr(Config, "CIRCUIT_BREAKER_THRESHOLD", 1)
+    monkeypatch.setattr(Config, "CIRCUIT_BREAKER_COOLDOWN", 60)
+    _plan(ai_service, StatusError("bad request", 400), [_event("a")])
+    
+    with pytest.raises(SDKError):
+        list(ai_service._stream_mistral_request([]))
+    assert ai_service._circuit_open_until > 0
+    
+    ai_service._circuit_open_until -= 61
+    assert list(ai_service._stream_mistral_request([])) == ["a"]
+    assert ai_service._consecutive_failures == 0
+    assert ai_service._circuit_open_until == 0.0
+
+def test_success_resets_the_failure_count(ai_service, monkeypatch):
+    monkeypatch.setattr(Config, "CIRCUIT_BREAKER_THRESHOLD", 2)
+    _plan(ai_service, StatusError("bad request", 400), [_event("a")], StatusError("bad request", 400), [_event("b")])
+    
+    with pytest.raises(SDKError):
+        list(ai_service._stream_mistral_request([]))
+    list(ai_service._stream_mistral_request([]))
+    with pytest.raises(SDKError):
+        list(ai_service._stream_mistral_request([]))
+    
+    assert list(ai_service._stream_mistral_request([])) == ["b"]
\ No newline at end of file
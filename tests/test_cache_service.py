@@ -0,0 +1,163 @@
+"""
+Tests for the BRD response cache
+"""
+
+import shelve
+
+import pytest
+
+from services import cache_service
+from services.cache_service import CacheService
+
+SECTIONS = {"Executive Summary": "Summary text", "Scope": "Scope text"}
+
+class FakeEmbedder:
+    """Embedding function returning fixed vectors and counting calls"""
+    
+    def __init__(self, vectors):
+        self.vectors = vectors
+        self.calls = []
+    
+    def __call__(self, text):
+        self.calls.append(text)
+        return self.vectors[text]
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return str(tmp_path / "brd_cache")
+
+def test_exact_hit_and_miss(cache_path):
+    cache = CacheService(cache_path=cache_path)
+    key = CacheService.make_key("model", "Pharma", "Title")
+    
+    assert cache.get(key) is None
+    cache.set(key, SECTIONS)
+    assert cache.get(key) == SECTIONS
+    assert cache.get(CacheService.make_key("model", "Pharma", "Other title")) is None
+
+def test_hits_return_copies(cache_path):
+    cache = CacheService(cache_path=cache_path)
+    cache.set("key", SECTIONS)
+    
+    cache.get("key")["Scope"] = "Changed"
+    assert cache.get("key") == SECTIONS
+
+def test_make_key_separates_parts():
+    assert CacheService.make_key("ab", "c") != CacheService.make_key("a", "bc")
+    assert CacheService.make_key("a", None) == CacheService.make_key("a", "")
+
+def test_entries_expire_after_ttl(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    cache = CacheService(cache_path=cache_path, ttl=60)
+    cache.set("key", SECTIONS)
+    
+    now[0] += 59
+    assert cache.get("key") == SECTIONS
+    now[0] += 2
+    assert cache.get("key") is None
+
+def test_expired_entries_are_removed_from_disk(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    cache = CacheService(cache_path=cache_path, ttl=60)
+    cache.set("key", SECTIONS)
+    
+    now[0] += 61
+    assert cache.get("key") is None
+    with shelve.open(cache_path) as db:
+        assert "key" not in db
+
+def test_expired_entries_are_removed_by_semantic_lookups(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    embedder = FakeEmbedder({"stored": [1.0, 0.0]})
+    cache = CacheService(cache_path=cache_path, embed_fn=embedder, ttl=60)
+    cache.set("key", SECTIONS, domain="Pharma", text="stored")
+    
+    now[0] += 61
+    assert cache.get("other", domain="Pharma", text="stored") is None
+    with shelve.open(cache_path) as db:
+        assert "key" not in db
+
+def test_entries_persist_across_instances(cache_path):
+    CacheService(cache_path=cache_path).set("key", SECTIONS, domain="Pharma")
+    
+    assert CacheService(cache_path=cache_path).get("key") == SECTIONS
+
+def test_expired_entries_are_purged_on_load(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    CacheService(cache_path=cache_path, ttl=60).set("key", SECTIONS)
+    
+    now[0] += 61
+    CacheService(cache_path=cache_path, ttl=60)
+    with shelve.open(cache_path) as db:
+        assert "key" not in db
+
+def test_load_keeps_the_newest_entries(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    cache = CacheService(cache_path=cache_path, max_entries=5)
+    for index in range(5):
+        now[0] += 1
+        cache.set(f"key{index}", {"Scope": str(index)})
+    
+    reloaded = CacheService(cache_path=cache_path, max_entries=2)
+    with shelve.open(cache_path) as db:
+        assert sorted(db.keys()) == ["key3", "key4"]
+    assert [reloaded.get(f"key{index}") for index in range(5)] == [
+        None, None, None, {"Scope": "3"}, {"Scope": "4"}
+    ]
+
+def test_disk_size_is_bounded_across_restarts(cache_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_service.time, "time", lambda: now[0])
+    for index in range(50):
+        now[0] += 10
+        CacheService(cache_path=cache_path, max_entries=5, ttl=60).set(f"key{index}", SECTIONS)
+    
+    with shelve.open(cache_path) as db:
+        assert len(db) <= 5
+
+def test_lru_eviction_is_persisted(cache_path):
+    cache = CacheService(cache_path=cache_path, max_entries=2)
+    cache.set("a", {"Scope": "a"})
+    cache.set("b", {"Scope": "b"})
+    cache.get("a")
+    cache.set("c", {"Scope": "c"})
+    
+    assert cache.get("b") is None
+    assert CacheService(cache_path=cache_path, max_entries=2).get("b") is None
+    assert cache.get("a") == {"Scope": "a"}
+
+def test_clear_removes_persisted_entries(cache_path):
+    cache = CacheService(cache_path=cache_path)
+    cache.set("key", SECTIONS)
+    cache.clear()
+    
+    assert cache.get("key") is None
+    assert CacheService(cache_path=cache_path).get("key") is None
+
+def test_semantic_hit_within_domain(cache_path):
+    embedder = FakeEmbedder({"stored": [1.0, 0.0], "similar": [0.99, 0.05], "different": [0.0, 1.0]})
+    cache = CacheService(cache_path=cache_path, embed_fn=embedder, similarity_threshold=0.95)
+    cache.set("key", SECTIONS, domain="Pharma", text="stored")
+    
+    assert cache.get("other", domain="Pharma", text="similar") == SECTIONS
+    assert cache.get("other", domain="Finance", text="similar") is None
+    assert cache.get("other", domain="Pharma", text="different") is None
+
+def test_miss_then_store_embeds_the_request_once(cache_path):
+    embedder = FakeEmbedder({"first": [1.0, 0.0], "second": [0.0, 1.0]})
+    cache = CacheService(cache_path=cache_path, embed_fn=embedder)
+    
+    # No candidates yet, so the lookup does not embed at all
+    assert cache.get("key1", domain="Pharma", text="first") is None
+    cache.set("key1", SECTIONS, domain="Pharma", text="first")
+    
+    # The miss embeds the query and the following store reuses that embedding
+    assert cache.get("key2", domain="Pharma", text="second") is None
+    cache.set("key2", SECTIONS, domain="Pharma", text="second")
+    
+    assert embedder.calls == ["first", "second"]
\ No newline at end of file
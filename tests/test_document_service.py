@@ -0,0 +1,143 @@
+"""
+Tests that the XML-rendered BRD export matches what python-docx produces
+"""
+
+import io
+import random
+import zipfile
+
+import pytest
+from docx import Document
+from docx.enum.text import WD_PARAGRAPH_ALIGNMENT
+
+from services import document_service
+from services.document_service import DocumentService
+
+def _reference_document(brd_sections, domain, project_title, metadata=None) -> bytes:
+    """Build the BRD with python-docx, the way DocumentService did before rendering XML directly"""
+    doc = Document()
+    
+    title = doc.add_heading('Business Requirement Document', 0)
+    title.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    doc.add_heading(project_title, 1).alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    domain_para = doc.add_paragraph()
+    domain_para.add_run(f"Domain: {domain}").bold = True
+    domain_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    if metadata:
+        doc.add_paragraph()
+        for key, value in metadata.items():
+            meta_para = doc.add_paragraph()
+            meta_para.add_run(f"{key}: ").bold = True
+            meta_para.add_run(str(value))
+            meta_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    doc.add_paragraph()
+    date_para = doc.add_paragraph()
+    date_para.add_run(f"Generated on: {document_service.datetime.now().strftime('%B %d, %Y')}")
+    date_para.alignment = WD_PARAGRAPH_ALIGNMENT.CENTER
+    doc.add_page_break()
+    
+    doc.add_heading('Table of Contents', 1)
+    for i, section in enumerate(brd_sections, 1):
+        para = doc.add_paragraph()
+        para.add_run(f"{i}. ").bold = True
+        para.add_run(section)
+        para.style = 'List Number'
+    doc.add_page_break()
+    
+    for section_number, (section_name, section_content) in enumerate(brd_sections.items(), 1):
+        doc.add_heading(f"{section_number}. {section_name}", 1)
+        if section_content:
+            for para_text in section_content.split('\n'):
+                para_text = para_text.strip()
+                if para_text:
+                    if para_text.startswith('-') or para_text.startswith('*'):
+                        doc.add_paragraph(para_text[1:].strip(), style='List Bullet')
+                    elif para_text[0].isdigit() and '.' in para_text[:3]:
+                        doc.add_paragraph(para_text, style='List Number')
+                    else:
+                        doc.add_paragraph(para_text)
+        else:
+            doc.add_paragraph("[Content to be developed]")
+        doc.add_paragraph()
+    
+    doc.add_page_break()
+    doc.add_heading('Appendix', 1)
+    doc.add_heading('Compliance References', 2)
+    compliance_items = document_service.COMPLIANCE_REFERENCES.get(
+        domain.lower(), document_service.DEFAULT_COMPLIANCE_REFERENCES
+    )
+    for item in compliance_items:
+        doc.add_paragraph(item, style='List Bullet')
+    doc.add_paragraph()
+    doc.add_heading('Glossary', 2)
+    doc.add_paragraph(document_service.GLOSSARY_TEMPLATE.format(domain=domain))
+    
+    output = io.BytesIO()
+    doc.save(output)
+    return output.getvalue()
+
+def _parts(package: bytes):
+    """Return a package's members as (name, bytes) pairs in archive order"""
+    with zipfile.ZipFile(io.BytesIO(package)) as archive:
+        return [(name, archive.read(name)) for name in archive.namelist()]
+
+@pytest.fixture
+def document_service_instance(tmp_path, monkeypatch):
+    monkeypatch.setattr(document_service.Config, "GENERATED_DIR", str(tmp_path))
+    return DocumentService()
+
+# Text fragments that exercise escaping, whitespace preservation, tabs, breaks and list detection
+TEXT_ATOMS = ["a", "&", "<b>", "\t", " ", "x y", "é✓", "\"q'", "]]>", "-", "*", "1.", "12.", "9x", "", "\r"]
+
+def _random_text(rng, max_atoms):
+    return "".join(rng.choice(TEXT_ATOMS) for _ in range(rng.randint(0, max_atoms)))
+
+def test_typical_brd_matches_python_docx(document_service_instance):
+    sections = {
+        "Project Overview": "Overview text\n\n- first bullet\n* second bullet\n1. numbered\n12. also numbered",
+        "Project Scope": "",
+        "Stakeholder Analysis": "Sponsor\tOwner"
+    }
+    metadata = {"Priority": "High", "Version": 2}
+    
+    _, package = document_service_instance.create_brd_bytes(sections, "Pharma", "Trial Portal", metadata)
+    
+    assert _parts(package) == _parts(_reference_document(sections, "Pharma", "Trial Portal", metadata))
+
+def test_random_brds_match_python_docx(document_service_instance):
+    rng = random.Random(2)
+    for _ in range(100):
+        sections = {
+            _random_text(rng, 4) or f"Section {index}": "\n".join(_random_text(rng, 6) for _ in range(rng.randint(0, 6)))
+            for index in range(rng.randint(0, 5))
+        }
+        metadata = rng.choice([None, {}, {"Priority": _random_text(rng, 3), " k ": ""}])
+        domain = rng.choice(["Pharma", "finance", "Other & <x>"])
+        title = _random_text(rng, 5) or "Title"
+        
+        _, package = document_service_instance.create_brd_bytes(sections, domain, title, metadata)
+        
+        assert _parts(package) == _parts(_reference_document(sections, domain, title, metadata))
+
+def test_fast_compression_stores_the_same_parts(document_service_instance):
+    sections = {"Project Overview": "Overview text"}
+    
+    _, default_package = document_service_instance.create_brd_bytes(sections, "Finance", "Title")
+    _, fast_package = document_service_instance.create_brd_bytes(sections, "Finance", "Title", compression="fast")
+    
+    assert _parts(fast_package) == _parts(default_package)
+    with zipfile.ZipFile(io.BytesIO(fast_package)) as archive:
+        assert {info.compress_type for info in archive.infolist()} == {zipfile.ZIP_STORED}
+
+@pytest.mark.parametrize("text", ["a\x00b", "x\x0by"])
+def test_text_python_docx_rejects_is_rejected(document_service_instance, text):
+    with pytest.raises(ValueError):
+        _reference_document({"Project Overview": text}, "Pharma", "Title")
+    with pytest.raises(ValueError):
+        document_service_instance.create_brd_bytes({"Project Overview": text}, "Pharma", "Title")
+
+def test_document_is_written_to_the_output_directory(document_service_instance, tmp_path):
+    filepath = document_service_instance.create_brd_document({"Project Overview": "Text"}, "Pharma", "My Project")
+    
+    assert filepath.startswith(str(tmp_path))
+    assert Document(filepath).paragraphs[0].text == 'Business Requirement Document'
\ No newline at end of file
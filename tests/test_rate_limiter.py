@@ -0,0 +1,57 @@
+"""
+Tests for the token-bucket rate limiter
+"""
+
+import pytest
+
+from services import rate_limiter
+from services.rate_limiter import RateLimiter
+
+class FakeClock:
+    """Monotonic clock that only moves when a test advances it"""
+    
+    def __init__(self):
+        self.now = 1000.0
+    
+    def __call__(self) -> float:
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", fake)
+    return fake
+
+def test_burst_requests_do_not_wait(clock):
+    limiter = RateLimiter(rate=2, burst=3)
+    
+    assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+def test_requests_beyond_burst_queue_at_the_sustained_rate(clock):
+    limiter = RateLimiter(rate=2, burst=1)
+    
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == pytest.approx(0.5)
+    assert limiter._reserve() == pytest.approx(1.0)
+
+def test_tokens_refill_over_time(clock):
+    limiter = RateLimiter(rate=2, burst=2)
+    limiter._reserve()
+    limiter._reserve()
+    
+    clock.now += 0.5
+    assert limiter._reserve() == 0.0
+    assert limiter._reserve() == pytest.approx(0.5)
+
+def test_refill_is_capped_at_burst(clock):
+    limiter = RateLimiter(rate=10, burst=2)
+    
+    clock.now += 60
+    assert [limiter._reserve() for _ in range(3)] == [0.0, 0.0, pytest.approx(0.1)]
+
+@pytest.mark.parametrize("rate", [0, -1])
+def test_non_positive_rate_disables_throttling(clock, rate):
+    limiter = RateLimiter(rate=rate, burst=1)
+    
+    assert [limiter._reserve() for _ in range(5)] == [0.0] * 5
+    limiter.acquire()
\ No newline at end of file
@@ -2,14 +2,44 @@
 Helper functions for BRD Generator
 """
 
+import functools
 import re
 import os
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import AbstractSet, Iterable, List, Dict, Any, Tuple, Union
 import logging
+import time
+import numpy as np
 
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import instead of being looked up in re's cache on every call
+UNSAFE_TEXT_CHARS_PATTERN = re.compile(r'[^\w\s\-\.\,\:\;\(\)\[\]\/\&\@]')
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+INVALID_FILENAME_CHARS_PATTERN = re.compile(r'[<>:"/\\|?*]')
+REPEATED_UNDERSCORES_PATTERN = re.compile(r'_+')
+PUNCTUATION_PATTERN = re.compile(r'[^\w\s]')
+
+# Flesch Reading Ease tokenization: sentences end at . ! or ?, words are runs of letters and
+# syllables are approximated by vowel groups
+SENTENCE_END_PATTERN = re.compile(r'[.!?]+')
+LETTER_PATTERN = re.compile(r'[A-Za-z]')
+WORD_PATTERN = re.compile(r'[A-Za-z]+')
+SYLLABLE_PATTERN = re.compile(r'[aeiouy]+', re.IGNORECASE)
+
+FILE_SIZE_UNITS = ("B", "KB", "MB", "GB")
+
+# Words too common to be keywords
+COMMON_WORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
+    'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
+    'after', 'above', 'below', 'between', 'among', 'this', 'that', 'these',
+    'those', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have',
+    'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
+    'may', 'might', 'must', 'can', 'shall', 'a', 'an', 'as', 'if', 'it',
+    'its', 'we', 'you', 'they', 'them', 'their', 'what', 'which',
+    'who', 'whom', 'when', 'where', 'why', 'how', 'i', 'me', 'my', 'your'
+})
+
 def clean_text(text: str) -> str:
     """
     Clean and normalize text content
@@ -23,16 +53,23 @@ def clean_text(text: str) -> str:
     if not text:
         return ""
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Remove special characters that might cause issues
-    text = re.sub(r'[^\w\s\-\.\,\:\;\(\)\[\]\/\&\@]', '', text)
-    
-    # Strip leading/trailing whitespace
-    text = text.strip()
+    # Collapse whitespace runs with str.split (C-level, no regex pass), then remove special
+    # characters that might cause issues; a removed character can leave a space at either end,
+    # so the result is stripped last
+    return UNSAFE_TEXT_CHARS_PATTERN.sub('', ' '.join(text.split())).strip()
+
+def clean_text_many(texts: Iterable[str]) -> List[str]:
+    """
+    Clean and normalize many texts (such as all sections of a BRD) in one call
     
-    return text
+    Args:
+        texts: Input texts to clean
+        
+    Returns:
+        Cleaned texts, as clean_text would return them
+    """
+    remove_unsafe_chars = UNSAFE_TEXT_CHARS_PATTERN.sub
+    return [remove_unsafe_chars('', ' '.join(text.split())).strip() if text else "" for text in texts]
 
 def validate_email(email: str) -> bool:
     """
@@ -44,8 +81,7 @@ def validate_email(email: str) -> bool:
     Returns:
         True if valid, False otherwise
     """
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(pattern, email))
+    return bool(EMAIL_PATTERN.match(email))
 
 def format_file_size(size_bytes: int) -> str:
     """
@@ -60,14 +96,12 @@ def format_file_size(size_bytes: int) -> str:
     if size_bytes == 0:
         return "0B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    
-    while size_bytes >= 1024 and i < len(size_names) - 1:
-        size_bytes /= 1024.0
-        i += 1
+    # Each unit is 2**10 times the previous one, so the unit follows from the size's bit length
+    unit = 0
+    if size_bytes >= 1024:
+        unit = min((int(size_bytes).bit_length() - 1) // 10, len(FILE_SIZE_UNITS) - 1)
     
-    return f"{size_bytes:.1f}{size_names[i]}"
+    return f"{size_bytes / (1 << (10 * unit)):.1f}{FILE_SIZE_UNITS[unit]}"
 
 def generate_unique_id() -> str:
     """
@@ -76,12 +110,13 @@ def generate_unique_id() -> str:
     Returns:
         Unique ID string
     """
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S")
     return f"BRD_{timestamp}"
 
+@functools.lru_cache(maxsize=1024)
 def safe_filename(filename: str) -> str:
     """
-    Create a safe filename by removing invalid characters
+    Create a safe filename by removing invalid characters (pure, so results are cached per name)
     
     Args:
         filename: Original filename
@@ -90,13 +125,13 @@ def safe_filename(filename: str) -> str:
         Safe filename
     """
     # Remove invalid characters
-    filename = re.sub(r'[<>:"/\\|?*]', '', filename)
+    filename = INVALID_FILENAME_CHARS_PATTERN.sub('', filename)
     
     # Replace spaces with underscores
     filename = filename.replace(' ', '_')
     
     # Remove multiple underscores
-    filename = re.sub(r'_+', '_', filename)
+    filename = REPEATED_UNDERSCORES_PATTERN.sub('_', filename)
     
     # Remove leading/trailing underscores
     filename = filename.strip('_')
@@ -121,69 +156,67 @@ def extract_keywords(text: str, min_length: int = 3) -> List[str]:
     if not text:
         return []
     
-    # Convert to lowercase and split into words
-    words = text.lower().split()
-    
-    # Filter out common words and short words
-    common_words = {
-        'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with',
-        'by', 'from', 'up', 'about', 'into', 'through', 'during', 'before',
-        'after', 'above', 'below', 'between', 'among', 'this', 'that', 'these',
-        'those', 'is', 'are', 'was', 'were', 'be', 'been', 'being', 'have',
-        'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should',
-        'may', 'might', 'must', 'can', 'shall', 'a', 'an', 'as', 'if', 'it',
-        'its', 'it', 'we', 'you', 'they', 'them', 'their', 'what', 'which',
-        'who', 'whom', 'when', 'where', 'why', 'how', 'i', 'me', 'my', 'your'
+    # Convert to lowercase, remove punctuation in one pass over the whole text and split into words
+    # (whitespace is kept, so the words are the same as stripping each one separately)
+    words = PUNCTUATION_PATTERN.sub('', text.lower()).split()
+    
+    # Keep distinct words, filtering out common words and short words
+    keywords = {
+        word for word in words
+        if len(word) >= min_length and word not in COMMON_WORDS and word.isalpha()
     }
     
-    keywords = []
-    for word in words:
-        # Remove punctuation
-        word = re.sub(r'[^\w]', '', word)
+    return list(keywords)
+
+def _readability_counts(text: str) -> Tuple[int, int, int]:
+    """Count the sentences, words and syllables of a text for Flesch Reading Ease"""
+    sentences = sum(1 for sentence in SENTENCE_END_PATTERN.split(text) if LETTER_PATTERN.search(sentence))
+    words = len(WORD_PATTERN.findall(text))
+    syllables = len(SYLLABLE_PATTERN.findall(text))
+    return sentences, words, syllables
+
+def _flesch_reading_ease(sentences, words, syllables):
+    """Apply the Flesch Reading Ease formula to scalar counts or to NumPy arrays of counts"""
+    return 206.835 - 1.015 * (words / sentences) - 84.6 * (syllables / words)
+
+def fres_batch(texts: List[str]) -> np.ndarray:
+    """
+    Calculate Flesch Reading Ease scores for many texts at once
+    
+    Args:
+        texts: Texts to analyze
         
-        # Check conditions
-        if (len(word) >= min_length and 
-            word not in common_words and 
-            word.isalpha()):
-            keywords.append(word)
-    
-    # Remove duplicates and return
-    return list(set(keywords))
+    Returns:
+        Array of scores (higher is easier to read, typically 0-100); NaN for texts without words
+    """
+    counts = np.array([_readability_counts(text or "") for text in texts], dtype=np.int64).reshape(-1, 3)
+    sentences, words, syllables = counts.T
+    
+    # The formula is applied once over the whole batch
+    scores = np.full(len(counts), np.nan)
+    scored = words > 0
+    scores[scored] = _flesch_reading_ease(sentences[scored], words[scored], syllables[scored])
+    return scores
 
 def calculate_readability_score(text: str) -> float:
     """
-    Calculate a simple readability score
+    Calculate a readability score from the Flesch Reading Ease formula
     
     Args:
         text: Text to analyze
         
     Returns:
-        Readability score between 0 and 1
+        Readability score between 0 and 1 (Flesch Reading Ease divided by 100 and clamped)
     """
     if not text:
         return 0.0
     
-    # Split into sentences
-    sentences = text.split('.')
-    sentences = [s.strip() for s in sentences if s.strip()]
+    sentences, words, syllables = _readability_counts(text)
     
-    if not sentences:
+    if not words:
         return 0.0
     
-    # Calculate average sentence length
-    total_words = sum(len(s.split()) for s in sentences)
-    avg_sentence_length = total_words / len(sentences)
-    
-    # Simple scoring based on sentence length
-    # Optimal sentence length is 15-20 words
-    if 15 <= avg_sentence_length <= 20:
-        return 1.0
-    elif 10 <= avg_sentence_length < 15 or 20 < avg_sentence_length <= 25:
-        return 0.8
-    elif 5 <= avg_sentence_length < 10 or 25 < avg_sentence_length <= 30:
-        return 0.6
-    else:
-        return 0.4
+    return min(max(_flesch_reading_ease(sentences, words, syllables) / 100, 0.0), 1.0)
 
 def create_directory_if_not_exists(directory_path: str) -> bool:
     """
@@ -199,7 +232,7 @@ def create_directory_if_not_exists(directory_path: str) -> bool:
         os.makedirs(directory_path, exist_ok=True)
         return True
     except Exception as e:
-        logger.error(f"Failed to create directory {directory_path}: {str(e)}")
+        logger.error("Failed to create directory %s: %s", directory_path, e)
         return False
 
 def get_file_extension(filename: str) -> str:
@@ -212,15 +245,25 @@ def get_file_extension(filename: str) -> str:
     Returns:
         File extension (including dot)
     """
-    return os.path.splitext(filename)[1].lower()
+    filename = os.fspath(filename)
+    dot = filename.rfind('.')
+    sep = filename.rfind(os.sep)
+    if os.altsep:
+        sep = max(sep, filename.rfind(os.altsep))
+    
+    # Same rule as os.path.splitext, without building the (root, ext) tuple: the dot must
+    # follow the last separator and something other than the file name's leading dots
+    if dot > sep and filename[sep + 1:dot].strip('.'):
+        return filename[dot:].lower()
+    return ""
 
-def is_valid_domain(domain: str, supported_domains: List[str]) -> bool:
+def is_valid_domain(domain: str, supported_domains: AbstractSet[str]) -> bool:
     """
     Validate if domain is supported
     
     Args:
         domain: Domain to validate
-        supported_domains: List of supported domains
+        supported_domains: Set of supported domains (e.g. Config.SUPPORTED_DOMAIN_SET), for an O(1) lookup
         
     Returns:
         True if valid, False otherwise
@@ -240,6 +283,20 @@ def format_percentage(value: float, decimal_places: int = 2) -> str:
     """
     return f"{value * 100:.{decimal_places}f}%"
 
+def format_percentage_batch(values: Iterable[float], decimal_places: int = 2) -> List[str]:
+    """
+    Format many values as percentages, building the format string once
+    
+    Args:
+        values: Values to format (0-1), e.g. a list or NumPy array
+        decimal_places: Number of decimal places
+        
+    Returns:
+        Formatted percentage strings, as format_percentage would return them
+    """
+    template = f"%.{decimal_places}f%%"
+    return [template % (value * 100) for value in values]
+
 def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     """
     Truncate text to specified length
@@ -257,6 +314,21 @@ def truncate_text(text: str, max_length: int = 100, suffix: str = "...") -> str:
     
     return text[:max_length - len(suffix)] + suffix
 
+def truncate_text_batch(texts: Iterable[str], max_length: int = 100, suffix: str = "...") -> List[str]:
+    """
+    Truncate many texts to the same length
+    
+    Args:
+        texts: Texts to truncate
+        max_length: Maximum length
+        suffix: Suffix to add if truncated
+        
+    Returns:
+        Truncated texts, as truncate_text would return them
+    """
+    keep = max_length - len(suffix)
+    return [text if not text or len(text) <= max_length else text[:keep] + suffix for text in texts]
+
 def merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
     """
     Merge two dictionaries
@@ -268,9 +340,8 @@ def merge_dicts(dict1: Dict[str, Any], dict2: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Merged dictionary
     """
-    result = dict1.copy()
-    result.update(dict2)
-    return result
+    # Unpacking builds the merged dict in one step; dict1 | dict2 would need Python 3.9+
+    return {**dict1, **dict2}
 
 def get_current_timestamp() -> str:
     """
@@ -279,7 +350,7 @@ def get_current_timestamp() -> str:
     Returns:
         Timestamp string
     """
-    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return time.strftime("%Y-%m-%d %H:%M:%S")
 
 def log_performance(func_name: str, start_time: float, end_time: float):
     """
@@ -290,16 +361,15 @@ def log_performance(func_name: str, start_time: float, end_time: float):
         start_time: Start time
         end_time: End time
     """
-    duration = end_time - start_time
-    logger.info(f"Performance: {func_name} took {duration:.2f} seconds")
+    logger.info("Performance: %s took %.2f seconds", func_name, end_time - start_time)
 
-def validate_json_structure(data: Dict[str, Any], required_keys: List[str]) -> bool:
+def validate_json_structure(data: Dict[str, Any], required_keys: Union[List[str], AbstractSet[str]]) -> bool:
     """
     Validate JSON structure has required keys
     
     Args:
         data: Dictionary to validate
-        required_keys: List of required keys
+        required_keys: Required keys; hot callers should pass a prebuilt frozenset
         
     Returns:
         True if valid, False otherwise
@@ -307,6 +377,10 @@ def validate_json_structure(data: Dict[str, Any], required_keys: List[str]) -> b
     if not isinstance(data, dict):
         return False
     
+    # A set of keys is checked against the dict's key view in one C-level subset test
+    if isinstance(required_keys, (set, frozenset)):
+        return data.keys() >= required_keys
+    
     for key in required_keys:
         if key not in data:
             return False